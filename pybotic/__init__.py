@@ -1,3 +1,5 @@
 from . import worlds
 from . import utils
 from . import geometry
+from . import planners
+from . import octree
@@ -0,0 +1,337 @@
+from dataclasses import dataclass
+import numpy as np
+from typing import Generator, Optional, Tuple
+
+from pybotic.worlds import Continous3D_Static
+from pybotic.utils.collision_utils import _chunks, points_in_boundary
+
+
+# node states
+FREE = 0
+OCCUPIED = 1
+MIXED = 2
+
+# octant of child c is (c >> 2 & 1, c >> 1 & 1, c & 1) along (x, y, z)
+_OCTANTS = np.array([[(c >> 2) & 1, (c >> 1) & 1, c & 1] for c in range(8)], dtype=np.int64)
+
+
+def _index_type(n: int) -> np.dtype:
+    """narrowest signed integer type that indexes n items"""
+    return np.dtype(np.int32) if n <= np.iinfo(np.int32).max else np.dtype(np.int64)
+
+
+def _reserve(buffer: np.ndarray, size: int) -> np.ndarray:
+    """grow a buffer in place to hold at least size items
+
+    the buffer grows by at least half, so the arrays of a level
+    are written without copying the levels built so far
+
+    Returns:
+        buffer (numpy.ndarray): the same buffer
+    """
+    if size > len(buffer):
+        buffer.resize(max(size, len(buffer) * 3 // 2), refcheck=False)
+    return buffer
+
+
+@dataclass
+class Octree:
+    """Array backed occupancy octree
+
+    Nodes are stored breadth first, the nodes of level l are
+    level_offsets[l]:level_offsets[l + 1]. The 8 children of a MIXED node
+    are stored contiguously starting at child[node], leaves have child -1.
+    Cell positions are implied by the layout, so a node costs 5 bytes.
+    Everything outside the boundary is treated as occupied by the queries,
+    the tree itself only resolves obstacle surfaces.
+
+    Args:
+        boundary (numpy.ndarray, shape=(6,)): limits of the world
+        origin (numpy.ndarray, shape=(3,)): min corner of the root cube
+        size (float): edge length of the root cube
+        depth (int): number of levels below the root
+        state (numpy.ndarray, shape=(n,), dtype=uint8): FREE, OCCUPIED or MIXED
+        child (numpy.ndarray, shape=(n,), dtype=int32): index of the first child,
+                                                        int64 past 2 ** 31 nodes
+        level_offsets (numpy.ndarray): first node of every level and the node count
+    """
+
+    boundary: np.ndarray
+    origin: np.ndarray
+    size: float
+    depth: int
+    state: np.ndarray
+    child: np.ndarray
+    level_offsets: np.ndarray
+
+    @classmethod
+    def build(cls, boundary: np.ndarray, boxes: np.ndarray, resolution: float):
+        """build from obstacle boxes
+
+        top down and one level at a time, every node only tests the
+        obstacles that touched its parent. Overlap is inclusive like the
+        collision helpers, so cells touching an obstacle face are occupied.
+        (node, obstacle) pairs are expanded and filtered in chunks and the
+        nodes are written into arrays that grow geometrically, so the peak
+        memory stays close to the size of the tree and the surviving pairs
+
+        Args:
+            boundary (numpy.ndarray, shape=(6,)): limits of the world
+            boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+            resolution (float): edge length of the smallest cells
+
+        Returns:
+            octree (Octree): the built tree
+
+        Raises:
+            ValueError: if resolution is not positive
+        """
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        boundary = np.asarray(boundary, dtype=float)
+        origin = boundary[:3]
+        extent = float(np.max(boundary[3:] - boundary[:3]))
+        depth = max(0, int(np.ceil(np.log2(max(extent, resolution) / resolution))))
+        size = resolution * 2 ** depth
+        # obstacle parts outside the boundary do not matter
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 6)
+        boxes = np.concatenate(
+            (np.maximum(boxes[:, :3], boundary[:3]), np.minimum(boxes[:, 3:], boundary[3:])),
+            axis=1,
+        )
+        boxes = boxes[np.all(boxes[:, :3] <= boxes[:, 3:], axis=1)]
+
+        coord_type = np.min_scalar_type(2 ** depth)
+        octants = _OCTANTS.astype(coord_type)
+        state = np.zeros(1024, dtype=np.uint8)
+        child = np.zeros(1024, dtype=np.int32)
+        offsets = [0]
+        # the root is child 0 of a virtual parent at the origin
+        parents = np.zeros((1, 3), dtype=coord_type)
+        split = np.ones(1, dtype=bool)
+        rank = np.zeros(1, dtype=np.int32)
+        # every box inside the boundary touches the root
+        pair_node = np.zeros(len(boxes), dtype=np.int32)
+        pair_box = np.arange(len(boxes), dtype=_index_type(len(boxes)))
+        for level in range(depth + 1):
+            # node j of the level is child j % 8 of the parent split node j // 8
+            m = 8 * len(parents) if level else 1
+            cell = size / 2 ** level
+            node_type = _index_type(m)
+            touched = np.zeros(m, dtype=bool)
+            full = np.zeros(m, dtype=bool)
+            next_node = np.zeros(0, dtype=node_type)
+            next_box = np.zeros(0, dtype=pair_box.dtype)
+            count = 0
+            for chunk in _chunks(len(pair_node), 8):
+                node, box = pair_node[chunk], pair_box[chunk]
+                if level:
+                    keep = split[node]
+                    node = 8 * rank[node[keep]].astype(node_type)
+                    node = (node[:, None] + np.arange(8, dtype=node_type)).ravel()
+                    box = np.repeat(box[keep], 8)
+                coords = 2 * parents[node >> 3] + octants[node & 7]
+                # inclusive overlap, only the part inside the boundary needs to be covered
+                overlap = np.ones(len(node), dtype=bool)
+                contain = np.ones(len(node), dtype=bool)
+                for axis in range(3):
+                    lo = origin[axis] + coords[:, axis] * cell
+                    hi = lo + cell
+                    box_lo, box_hi = boxes[box, axis], boxes[box, axis + 3]
+                    overlap &= (box_lo <= hi) & (box_hi >= lo)
+                    contain &= (box_lo <= lo) & (box_hi >= np.minimum(hi, boundary[axis + 3]))
+                touched[node[overlap]] = True
+                full[node[contain]] = True
+                if level < depth:
+                    # the leaves need no pairs, they only split further
+                    n_overlap = int(overlap.sum())
+                    next_node = _reserve(next_node, count + n_overlap)
+                    next_box = _reserve(next_box, count + n_overlap)
+                    next_node[count:count + n_overlap] = node[overlap]
+                    next_box[count:count + n_overlap] = box[overlap]
+                    count += n_overlap
+
+            n_nodes = offsets[-1] + m
+            state = _reserve(state, n_nodes)
+            level_state = state[offsets[-1]:n_nodes]
+            level_state[:] = FREE
+            if level == depth:
+                level_state[touched] = OCCUPIED
+                n_split = 0
+            else:
+                split = touched & ~full
+                level_state[full] = OCCUPIED
+                level_state[split] = MIXED
+                rank = np.cumsum(split, dtype=node_type) - 1
+                n_split = int(rank[-1]) + 1
+            if n_nodes + 8 * n_split > np.iinfo(child.dtype).max:
+                child = child.astype(np.int64)
+            child = _reserve(child, n_nodes)
+            level_child = child[offsets[-1]:n_nodes]
+            level_child[:] = -1
+            if n_split:
+                level_child[split] = n_nodes + 8 * rank[split].astype(child.dtype)
+            offsets.append(n_nodes)
+            if not n_split:
+                break
+
+            split_nodes = np.flatnonzero(split)
+            parents = 2 * parents[split_nodes >> 3] + octants[split_nodes & 7]
+            pair_node, pair_box = next_node[:count], next_box[:count]
+
+        state.resize(offsets[-1], refcheck=False)
+        child.resize(offsets[-1], refcheck=False)
+        return cls(
+            boundary,
+            origin,
+            float(size),
+            depth,
+            state,
+            child,
+            np.array(offsets, dtype=np.int64),
+        )
+
+    @classmethod
+    def create_from_world(cls, world: Continous3D_Static, resolution: float):
+        """build from a world
+
+        Args:
+            world (Continous3D_Static): world to represent
+            resolution (float): edge length of the smallest cells
+
+        Returns:
+            octree (Octree): the built tree
+        """
+        return cls.build(world.get_boundary_array(), world.get_obstacle_array(), resolution)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.state)
+
+    @property
+    def memory_bytes(self) -> int:
+        """memory used by the node arrays"""
+        return self.state.nbytes + self.child.nbytes + self.level_offsets.nbytes
+
+    def _bounds(self, level: int, coords: np.ndarray) -> np.ndarray:
+        """cubes of cells
+
+        Args:
+            level (int): level of the cells
+            coords (numpy.ndarray, shape=(m, 3)): cell indices in the level
+
+        Returns:
+            bounds (numpy.ndarray, shape=(m, 6)): cell cubes
+        """
+        cell = self.size / 2 ** level
+        lo = self.origin + coords * cell
+        return np.concatenate((lo, lo + cell), axis=1)
+
+    def is_occupied(self, points: np.ndarray) -> np.ndarray:
+        """point occupancy
+
+        vectorized descent from the root, points outside the boundary
+        are occupied
+
+        Args:
+            points (numpy.ndarray, shape=(M, 3)): query points
+
+        Returns:
+            occupied (numpy.ndarray, shape=(M,), dtype=bool): True if occupied
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        relative = (points - self.origin) / self.size
+        node = np.zeros(len(points), dtype=np.int64)
+        for level in range(1, self.depth + 1):
+            active = np.flatnonzero(self.state[node] == MIXED)
+            if not len(active):
+                break
+            index = np.floor(relative[active] * 2 ** level).astype(np.int64)
+            index = np.clip(index, 0, 2 ** level - 1) & 1
+            node[active] = self.child[node[active]] + (index @ np.array([4, 2, 1]))
+        return (self.state[node] == OCCUPIED) | ~points_in_boundary(points, self.boundary)
+
+    def query_boxes(self, boxes: np.ndarray) -> np.ndarray:
+        """box occupancy
+
+        Args:
+            boxes (numpy.ndarray, shape=(B, 6)): normalized query boxes
+
+        Returns:
+            state (numpy.ndarray, shape=(B,), dtype=uint8): FREE if the box
+                touches no occupied cell, OCCUPIED if it only touches occupied
+                cells, MIXED otherwise
+        """
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 6)
+        has_free = np.zeros(len(boxes), dtype=bool)
+        has_occupied = np.any(
+            (boxes[:, :3] < self.boundary[:3]) | (boxes[:, 3:] > self.boundary[3:]), axis=1
+        )
+        # degenerate (flat) query boxes still touch the cells they lie on
+        flat = np.any(boxes[:, :3] == boxes[:, 3:], axis=1)
+        pair_box = np.arange(len(boxes))
+        pair_node = np.zeros(len(boxes), dtype=np.int64)
+        pair_coords = np.zeros((len(boxes), 3), dtype=np.int64)
+        level = 0
+        while len(pair_box):
+            bounds = self._bounds(level, pair_coords)
+            lo, hi = boxes[pair_box, :3], boxes[pair_box, 3:]
+            overlap = np.all((lo < bounds[:, 3:]) & (hi > bounds[:, :3]), axis=1)
+            overlap |= flat[pair_box] & np.all(
+                (lo <= bounds[:, 3:]) & (hi >= bounds[:, :3]), axis=1
+            )
+            pair_box, pair_node = pair_box[overlap], pair_node[overlap]
+            pair_coords = pair_coords[overlap]
+            state = self.state[pair_node]
+            has_free[pair_box[state == FREE]] = True
+            has_occupied[pair_box[state == OCCUPIED]] = True
+
+            mixed = state == MIXED
+            pair_box = np.repeat(pair_box[mixed], 8)
+            pair_node = (self.child[pair_node[mixed]][:, None] + np.arange(8)).ravel()
+            pair_coords = (2 * pair_coords[mixed, None, :] + _OCTANTS[None]).reshape(-1, 3)
+            level += 1
+
+        result = np.full(len(boxes), MIXED, dtype=np.uint8)
+        result[has_free & ~has_occupied] = FREE
+        result[has_occupied & ~has_free] = OCCUPIED
+        return result
+
+    def levels(self) -> Generator[Tuple[int, np.ndarray, np.ndarray], None, None]:
+        """coarse to fine traversal
+
+        cell positions are not stored, they are rebuilt level by level
+        from the child layout
+
+        Yields:
+            level (int): level, 0 is the root
+            bounds (numpy.ndarray, shape=(m, 6)): cubes of the level's nodes
+            state (numpy.ndarray, shape=(m,)): states of the level's nodes
+        """
+        coords = np.zeros((1, 3), dtype=np.int64)
+        for level in range(len(self.level_offsets) - 1):
+            state = self.state[self.level_offsets[level]:self.level_offsets[level + 1]]
+            yield level, self._bounds(level, coords), state
+            coords = (2 * coords[state == MIXED, None, :] + _OCTANTS[None]).reshape(-1, 3)
+
+    def leaves(self, max_level: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """leaf cells
+
+        cut the tree at max_level, nodes at the cut keep their state
+
+        Args:
+            max_level (Optional[int]): deepest level to descend to, full depth if None
+
+        Returns:
+            bounds (numpy.ndarray, shape=(m, 6)): cubes of the cells
+            state (numpy.ndarray, shape=(m,)): states of the cells
+        """
+        last = self.depth if max_level is None else max_level
+        bounds, states = [], []
+        for level, cubes, state in self.levels():
+            keep = np.ones(len(state), dtype=bool) if level == last else state != MIXED
+            bounds.append(cubes[keep])
+            states.append(state[keep])
+            if level == last:
+                break
+        return np.concatenate(bounds), np.concatenate(states)
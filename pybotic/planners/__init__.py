@@ -0,0 +1,2 @@
+from .prm import Roadmap, roadmap_path
+from .grid import GridPlanner, CacheStats
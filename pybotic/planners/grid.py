@@ -0,0 +1,305 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import heapq
+import itertools
+import numpy as np
+from typing import List, Optional, Tuple, Union
+from typeguard import typechecked
+
+from pybotic.geometry import Point3D
+from pybotic.worlds import Continous3D_Static
+from pybotic.utils.collision_utils import occupancy_grid, segments_collide
+
+
+@dataclass
+class CacheStats:
+    """Cost-to-go cache statistics
+
+    Args:
+        hits (int): queries answered from the cache
+        misses (int): queries that ran a search
+        evictions (int): fields dropped by the LRU policy
+        invalidations (int): times the world changed and the cache was cleared
+        entries (int): fields currently cached
+        memory_bytes (int): memory used by the cached fields
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    memory_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """fraction of queries answered from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _moves(
+    strides: Tuple[int, int, int], cell: np.ndarray
+) -> List[Tuple[int, float, Tuple[int, ...]]]:
+    """26-connected moves on a flattened grid
+
+    diagonal moves need every cell they sweep past to be free,
+    so paths never cut the corner of an occupied cell
+
+    Args:
+        strides (Tuple[int, int, int]): flat index step along each axis
+        cell (numpy.ndarray, shape=(3,)): cell size along each axis
+
+    Returns:
+        moves (List): (flat offset, length, flat offsets that must be free)
+    """
+    moves = []
+    for step in itertools.product((-1, 0, 1), repeat=3):
+        if not any(step):
+            continue
+        sweep = [
+            sub
+            for sub in itertools.product(*[(0, s) if s else (0,) for s in step])
+            if any(sub) and sub != step
+        ]
+        moves.append(
+            (
+                int(np.dot(step, strides)),
+                float(np.linalg.norm(np.multiply(step, cell))),
+                tuple(int(np.dot(sub, strides)) for sub in sweep),
+            )
+        )
+    return moves
+
+
+class GridPlanner:
+    """Dijkstra planner on an occupancy grid with cost-to-go reuse
+
+    For every goal a reverse Dijkstra search computes the cost-to-go of
+    every cell. The fields are cached per goal cell and evicted least
+    recently used first, so repeated queries to the same goal only follow
+    the steepest descent of the field, O(path length). The cache is
+    cleared when the world version changes, see World.invalidate.
+    Cells touching an obstacle are blocked, a start or goal in such a
+    cell is moved to the nearest free cell it can see.
+
+    Args:
+        world (Continous3D_Static): world to plan in
+        resolution (float): target edge length of the grid cells, the cells
+                            are shrunk per axis to tile the boundary exactly
+        cache_size (int): maximum number of cached fields
+        max_cache_bytes (Optional[int]): memory limit of the cached fields
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        world: Continous3D_Static,
+        resolution: Union[float, int],
+        cache_size: int = 8,
+        max_cache_bytes: Optional[int] = None,
+    ) -> None:
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        self.world = world
+        self.resolution = resolution
+        self.cache_size = cache_size
+        self.max_cache_bytes = max_cache_bytes
+        self.stats = CacheStats()
+        self._cache = OrderedDict()
+        self._version = None
+        # the grid attributes are all set here
+        self._sync()
+
+    def _sync(self) -> None:
+        """rebuild the grid and clear the cache if the world changed"""
+        if self.world.version == self._version:
+            return
+        if self._version is not None:
+            self.stats.invalidations += 1
+        self._version = self.world.version
+        self._cache.clear()
+        self.stats.entries = self.stats.memory_bytes = 0
+
+        boundary = self.world.get_boundary_array()
+        extent = boundary[3:] - boundary[:3]
+        self.boundary = boundary
+        self.shape = tuple(
+            int(n) for n in np.maximum(np.ceil(extent / self.resolution), 1)
+        )
+        self.cell = extent / self.shape
+        grid = occupancy_grid(boundary, self.world.get_obstacle_array(), self.shape)
+        # an occupied border removes every bounds check from the search
+        padded = np.pad(grid, 1, constant_values=True)
+        self._padded_shape = padded.shape
+        self._free = (~padded).ravel().tolist()
+        strides = (padded.shape[1] * padded.shape[2], padded.shape[2], 1)
+        self._moves = _moves(strides, self.cell)
+
+    def _cell(self, point: Point3D) -> int:
+        """padded flat index of the cell holding point
+
+        Raises:
+            ValueError: if point is outside the boundary
+        """
+        point = np.asarray(tuple(point), dtype=float)
+        lower, upper = self.boundary[:3], self.boundary[3:]
+        if np.any(point < lower) or np.any(point > upper):
+            raise ValueError("point outside the boundary")
+        index = np.minimum(
+            ((point - lower) / self.cell).astype(int), np.array(self.shape) - 1
+        )
+        return int(np.ravel_multi_index(tuple(index + 1), self._padded_shape))
+
+    def _free_cell(self, point: Point3D) -> int:
+        """padded flat index of the cell used for point
+
+        the cell holding point, or if it is blocked the nearest free cell
+        whose center point can see. The neighbourhood searched doubles
+        until a visible cell is found or it covers the grid
+
+        Returns:
+            cell (int): the free cell, the blocked one if none is visible
+
+        Raises:
+            ValueError: if point is outside the boundary
+        """
+        cell = self._cell(point)
+        if self._free[cell]:
+            return cell
+        point = np.asarray(tuple(point), dtype=float)
+        boxes = self.world.get_obstacle_array()
+        center = np.array(np.unravel_index(cell, self._padded_shape))
+        radius = 1
+        while True:
+            lower = np.maximum(center - radius, 1)
+            upper = np.minimum(center + radius, np.array(self.shape))
+            index = np.stack(
+                np.meshgrid(*map(np.arange, lower, upper + 1), indexing="ij"), axis=-1
+            ).reshape(-1, 3)
+            flat = np.ravel_multi_index(tuple(index.T), self._padded_shape)
+            free = np.array([self._free[i] for i in flat.tolist()], dtype=bool)
+            flat, index = flat[free], index[free]
+            centers = self.boundary[:3] + (index - 0.5) * self.cell
+            order = np.argsort(np.linalg.norm(centers - point, axis=1), kind="stable")
+            visible = ~segments_collide(
+                np.broadcast_to(point, (len(order), 3)), centers[order], boxes
+            )
+            if visible.any():
+                return int(flat[order[np.argmax(visible)]])
+            if np.all(lower == 1) and np.all(upper == self.shape):
+                return cell
+            radius *= 2
+
+    def _search(self, goal: int) -> np.ndarray:
+        """reverse Dijkstra from the goal cell
+
+        Args:
+            goal (int): padded flat index of the goal cell
+
+        Returns:
+            field (numpy.ndarray, dtype=float32): cost-to-go of every padded cell,
+                                                   inf where unreachable
+        """
+        free = self._free
+        cost = [np.inf] * len(free)
+        if free[goal]:
+            cost[goal] = 0.0
+            heap = [(0.0, goal)]
+            while heap:
+                value, cell = heapq.heappop(heap)
+                if value > cost[cell]:
+                    continue  # stale entry
+                for offset, length, sweep in self._moves:
+                    neighbour = cell + offset
+                    if not free[neighbour]:
+                        continue
+                    new_value = value + length
+                    if new_value < cost[neighbour] and all(
+                        free[cell + s] for s in sweep
+                    ):
+                        cost[neighbour] = new_value
+                        heapq.heappush(heap, (new_value, neighbour))
+        return np.array(cost, dtype=np.float32)
+
+    def cost_to_go(self, goal: Point3D) -> np.ndarray:
+        """cost-to-go field of a goal
+
+        Args:
+            goal (Point3D): goal location
+
+        Returns:
+            field (numpy.ndarray, shape=grid shape, dtype=float32): distance to the
+                goal along the grid, inf where unreachable
+        """
+        self._sync()
+        return self._field(self._free_cell(goal))[1:-1, 1:-1, 1:-1].copy()
+
+    def _field(self, goal: int) -> np.ndarray:
+        """cached padded field of a goal cell"""
+        if goal in self._cache:
+            self.stats.hits += 1
+            self._cache.move_to_end(goal)
+            return self._cache[goal].reshape(self._padded_shape)
+
+        self.stats.misses += 1
+        field = self._search(goal)
+        self._cache[goal] = field
+        self.stats.memory_bytes += field.nbytes
+        while len(self._cache) > 1 and (
+            len(self._cache) > self.cache_size
+            or (
+                self.max_cache_bytes is not None
+                and self.stats.memory_bytes > self.max_cache_bytes
+            )
+        ):
+            _, evicted = self._cache.popitem(last=False)
+            self.stats.memory_bytes -= evicted.nbytes
+            self.stats.evictions += 1
+        self.stats.entries = len(self._cache)
+        return field.reshape(self._padded_shape)
+
+    @typechecked
+    def plan(
+        self, start: Optional[Point3D] = None, goal: Optional[Point3D] = None
+    ) -> Optional[np.ndarray]:
+        """plan a path
+
+        follow the steepest descent of the cached cost-to-go field
+
+        Args:
+            start (Optional[Point3D]): start, world robot pose if None
+            goal (Optional[Point3D]): goal, world goal if None
+
+        Returns:
+            path (Optional[numpy.ndarray], shape=(K, 3)): start, cell centers and
+                                                          goal, None if unreachable
+
+        Raises:
+            ValueError: if start or goal is outside the boundary
+        """
+        start = self.world._robot_pose if start is None else start
+        goal = self.world._goal if goal is None else goal
+        self._sync()
+        goal_cell = self._free_cell(goal)
+        cell = self._free_cell(start)
+        field = self._field(goal_cell).ravel()
+        if not np.isfinite(field[cell]):
+            return None
+
+        cells = [cell]
+        while cell != goal_cell:
+            # the field strictly decreases along the best move
+            best, best_value = cell, np.inf
+            for offset, length, sweep in self._moves:
+                neighbour = cell + offset
+                value = field[neighbour] + length
+                if value < best_value and all(self._free[cell + s] for s in sweep):
+                    best, best_value = neighbour, value
+            cell = best
+            cells.append(cell)
+
+        index = np.stack(np.unravel_index(cells, self._padded_shape), axis=1) - 1
+        centers = self.boundary[:3] + (index + 0.5) * self.cell
+        ends = np.array([tuple(start), tuple(goal)], dtype=float)
+        return np.concatenate((ends[:1], centers, ends[1:]))
@@ -0,0 +1,270 @@
+from dataclasses import dataclass
+import heapq
+import os
+import numpy as np
+from typing import Optional
+from typeguard import typechecked
+
+from pybotic.geometry import Point3D
+from pybotic.worlds import Continous3D_Static
+from pybotic.utils.collision_utils import segments_collide
+from pybotic.utils.spatial_utils import radius_pairs
+from pybotic.utils.sampling_utils import Seed_Type
+
+
+ROADMAP_EXT = ".prm.npz"
+
+
+def roadmap_path(map_file: str) -> str:
+    """roadmap path for a map file
+
+    roadmaps are stored next to the map they were built for
+        maps/site.txt -> maps/site.prm.npz
+
+    Args:
+        map_file (str): path to the map file
+
+    Returns:
+        path (str): path of the roadmap file
+    """
+    return os.path.splitext(map_file)[0] + ROADMAP_EXT
+
+
+@dataclass
+class Roadmap:
+    """Probabilistic roadmap
+
+    undirected graph over collision free nodes, stored in CSR form
+    neighbours of node i are indices[indptr[i]:indptr[i + 1]]
+
+    Args:
+        nodes (numpy.ndarray, shape=(N, 3)): node locations
+        indptr (numpy.ndarray, shape=(N + 1,)): CSR row pointers
+        indices (numpy.ndarray, shape=(2E,)): CSR column indices
+        weights (numpy.ndarray, shape=(2E,)): euclidean edge lengths
+        radius (float): connection radius used while building
+        fingerprint (str): fingerprint of the world it was built for
+    """
+
+    nodes: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+    radius: float
+    fingerprint: str = ""
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices) // 2
+
+    @classmethod
+    def build(
+        cls,
+        world: Continous3D_Static,
+        n_nodes: int,
+        radius: Optional[float] = None,
+        k: Optional[int] = 10,
+        mode: str = "batched",
+        seed: Seed_Type = None,
+    ):
+        """build a roadmap
+
+        sample nodes in vectorized batches, find neighbours with a hashed
+        grid and validate all candidate edges in one batched collision call
+
+        Args:
+            world (Continous3D_Static): world to build the roadmap in
+            n_nodes (int): number of nodes to sample
+            radius (Optional[float]): connection radius, if None 2x the
+                                      average node spacing
+            k (Optional[int]): maximum neighbours per node, None for all
+            mode (str): sampling mode, see Continous3D_Static.sample_free
+            seed (None, int, numpy.random.Generator): seed for reproducibility
+
+        Returns:
+            roadmap (Roadmap): the built roadmap
+        """
+        boundary = world.get_boundary_array()
+        boxes = world.get_obstacle_array()
+        if radius is None:
+            volume = np.prod(np.maximum(boundary[3:] - boundary[:3], 1e-9))
+            radius = 2.0 * float(np.cbrt(volume / max(n_nodes, 1)))
+
+        nodes, _ = world.sample_free(n_nodes, mode=mode, seed=seed)
+        i, j, dist = radius_pairs(nodes, radius, k=k)
+        free = ~segments_collide(nodes[i], nodes[j], boxes)
+        i, j, dist = i[free], j[free], dist[free]
+
+        # both directions, sorted by source
+        src = np.concatenate((i, j))
+        dst = np.concatenate((j, i))
+        weights = np.concatenate((dist, dist))
+        order = np.argsort(src, kind="stable")
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(nodes)), out=indptr[1:])
+        return cls(
+            nodes, indptr, dst[order], weights[order], float(radius), world.fingerprint()
+        )
+
+    def save(self, f_name: str) -> None:
+        """save the roadmap
+
+        Args:
+            f_name (str): path to save to, should end with .npz
+        """
+        np.savez_compressed(
+            f_name,
+            nodes=self.nodes,
+            indptr=self.indptr,
+            indices=self.indices,
+            weights=self.weights,
+            radius=self.radius,
+            fingerprint=self.fingerprint,
+        )
+
+    @classmethod
+    def load(cls, f_name: str, world: Optional[Continous3D_Static] = None):
+        """load a roadmap
+
+        Args:
+            f_name (str): path to a saved roadmap
+            world (Optional[Continous3D_Static]): if given, make sure the
+                                                   roadmap was built for it
+
+        Returns:
+            roadmap (Roadmap): loaded roadmap
+
+        Raises:
+            FileNotFoundError: if f_name is not a valid file
+            ValueError: if the roadmap was built for a different world
+        """
+        if not os.path.isfile(f_name):
+            raise FileNotFoundError("No such file found")
+        with np.load(f_name) as data:
+            roadmap = cls(
+                data["nodes"],
+                data["indptr"],
+                data["indices"],
+                data["weights"],
+                float(data["radius"]),
+                str(data["fingerprint"]),
+            )
+        if world is not None and roadmap.fingerprint != world.fingerprint():
+            raise ValueError("roadmap was built for a different world")
+        return roadmap
+
+    @classmethod
+    def load_or_build(cls, world: Continous3D_Static, map_file: str, n_nodes: int, **kwargs):
+        """load the roadmap stored next to map_file or build and save it
+
+        a stored roadmap built for a different world is rebuilt
+
+        Args:
+            world (Continous3D_Static): world created from map_file
+            map_file (str): path to the map file
+            n_nodes (int): number of nodes if building
+            **kwargs: forwarded to Roadmap.build
+
+        Returns:
+            roadmap (Roadmap): roadmap for the world
+        """
+        f_name = roadmap_path(map_file)
+        if os.path.isfile(f_name):
+            try:
+                return cls.load(f_name, world)
+            except ValueError:
+                pass
+        roadmap = cls.build(world, n_nodes, **kwargs)
+        roadmap.save(f_name)
+        return roadmap
+
+    def _connect(self, boxes: np.ndarray, point: np.ndarray, k: int) -> np.ndarray:
+        """connect a query point to the roadmap
+
+        Args:
+            boxes (numpy.ndarray, shape=(N, 6)): obstacles of the world
+            point (numpy.ndarray, shape=(3,)): point to connect
+            k (int): number of nearest nodes to try
+
+        Returns:
+            edges (numpy.ndarray, shape=(C, 2)): (node, length) of free connections
+        """
+        dist = np.linalg.norm(self.nodes - point, axis=1)
+        nearest = np.argsort(dist)[:k]
+        starts = np.broadcast_to(point, (len(nearest), 3))
+        free = ~segments_collide(starts, self.nodes[nearest], boxes)
+        return np.stack((nearest[free], dist[nearest[free]]), axis=1)
+
+    @typechecked
+    def query(
+        self,
+        world: Continous3D_Static,
+        start: Optional[Point3D] = None,
+        goal: Optional[Point3D] = None,
+        k: int = 10,
+    ) -> Optional[np.ndarray]:
+        """find a path through the roadmap
+
+        connect start and goal to their k nearest visible nodes and run
+        A* over the CSR graph
+
+        Args:
+            world (Continous3D_Static): world the roadmap was built for
+            start (Optional[Point3D]): start, world robot pose if None
+            goal (Optional[Point3D]): goal, world goal if None
+            k (int): nearest nodes tried when connecting start and goal
+
+        Returns:
+            path (Optional[numpy.ndarray], shape=(K, 3)): waypoints from start
+                                                          to goal, None if no path
+        """
+        start = world._robot_pose if start is None else start
+        goal = world._goal if goal is None else goal
+        start = np.asarray(tuple(start), dtype=float)
+        goal = np.asarray(tuple(goal), dtype=float)
+        boxes = world.get_obstacle_array()
+        if not segments_collide(start, goal, boxes)[0]:
+            return np.stack((start, goal))
+
+        # virtual nodes: n is start, n + 1 is goal
+        n = self.n_nodes
+        from_start = self._connect(boxes, start, k)
+        to_goal = {int(node): length for node, length in self._connect(boxes, goal, k)}
+        points = np.concatenate((self.nodes, start[None], goal[None]))
+        heuristic = np.linalg.norm(points - goal, axis=1)
+
+        cost = np.full(n + 2, np.inf)
+        parent = np.full(n + 2, -1, dtype=np.int64)
+        cost[n] = 0.0
+        heap = [(heuristic[n], n)]
+        while heap:
+            priority, node = heapq.heappop(heap)
+            if node == n + 1:
+                break
+            if priority > cost[node] + heuristic[node]:
+                continue  # stale entry
+            if node == n:
+                neighbours, lengths = from_start[:, 0].astype(np.int64), from_start[:, 1]
+            else:
+                row = slice(self.indptr[node], self.indptr[node + 1])
+                neighbours, lengths = self.indices[row], self.weights[row]
+                if node in to_goal:
+                    neighbours = np.append(neighbours, n + 1)
+                    lengths = np.append(lengths, to_goal[node])
+            new_cost = cost[node] + lengths
+            better = new_cost < cost[neighbours]
+            for neighbour, value in zip(neighbours[better], new_cost[better]):
+                cost[neighbour] = value
+                parent[neighbour] = node
+                heapq.heappush(heap, (value + heuristic[neighbour], neighbour))
+
+        if parent[n + 1] < 0:
+            return None
+        path = [n + 1]
+        while path[-1] != n:
+            path.append(parent[path[-1]])
+        return points[path[::-1]]
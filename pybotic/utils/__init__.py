@@ -1 +1,8 @@
-from .world_utils import load_3d_map_from_file
+from .world_utils import (
+    load_3d_map_from_file,
+    load_3d_maps_from_files,
+    load_3d_maps_async,
+    load_3d_maps,
+)
+from .sampling_utils import sample_free_points, SamplingStats
+from .path_utils import shortcut_path, resample_path, smooth_path
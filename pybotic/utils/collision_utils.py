@@ -0,0 +1,229 @@
+import numpy as np
+from typing import Dict, Iterable, Tuple
+
+from pybotic.geometry import Cuboid
+
+# Number of (item, obstacle) pairs evaluated at once, bounds peak memory
+CHUNK_PAIRS = 1 << 20
+
+
+def _normalize(arr: np.ndarray) -> np.ndarray:
+    """sort the corners of (N, 6) boxes per axis"""
+    return np.concatenate(
+        (np.minimum(arr[:, :3], arr[:, 3:]), np.maximum(arr[:, :3], arr[:, 3:])), axis=1
+    )
+
+
+def _fields(cuboid: Cuboid) -> Tuple[float, ...]:
+    """read the six bounds without dataclasses.astuple, which deep copies"""
+    return (
+        cuboid.x_min,
+        cuboid.y_min,
+        cuboid.z_min,
+        cuboid.x_max,
+        cuboid.y_max,
+        cuboid.z_max,
+    )
+
+
+def cuboid_to_array(cuboid: Cuboid) -> np.ndarray:
+    """cuboid to array
+
+    convert a Cuboid to its normalized array form, the map files
+    do not guarantee min <= max so the corners are sorted per axis
+
+    Args:
+        cuboid (Cuboid): cuboid to convert
+
+    Returns:
+        box (numpy.ndarray, shape=(6,)): [x_min, y_min, z_min, x_max, y_max, z_max]
+    """
+    return _normalize(np.array([_fields(cuboid)], dtype=float))[0]
+
+
+def obstacles_to_array(obstacles: Dict[str, Cuboid]) -> np.ndarray:
+    """obstacles to array
+
+    stack the obstacle dictionary of a world into a single array,
+    rows follow the iteration order of the dictionary
+
+    Args:
+        obstacles (Dict[str, Cuboid]): dictionary of obstacles
+
+    Returns:
+        boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+    """
+    if not obstacles:
+        return np.zeros((0, 6))
+    return _normalize(
+        np.array([_fields(obstacle) for obstacle in obstacles.values()], dtype=float)
+    )
+
+
+def _chunks(n_items: int, n_boxes: int) -> Iterable[slice]:
+    """chunk helper
+
+    split n_items so that each chunk has at most CHUNK_PAIRS pairs
+
+    Args:
+        n_items (int): number of points/segments
+        n_boxes (int): number of boxes
+
+    Yields:
+        chunk (slice): slice over the items
+    """
+    step = max(1, CHUNK_PAIRS // max(1, n_boxes))
+    for start in range(0, n_items, step):
+        yield slice(start, min(start + step, n_items))
+
+
+def points_in_boundary(points: np.ndarray, boundary: np.ndarray) -> np.ndarray:
+    """points in boundary
+
+    Args:
+        points (numpy.ndarray, shape=(M, 3)): query points
+        boundary (numpy.ndarray, shape=(6,)): limits of the world
+
+    Returns:
+        inside (numpy.ndarray, shape=(M,), dtype=bool): True if inside (inclusive)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    return np.all((points >= boundary[:3]) & (points <= boundary[3:]), axis=1)
+
+
+def points_in_cuboids(points: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """points in cuboids
+
+    vectorized check of many points against many boxes
+
+    Args:
+        points (numpy.ndarray, shape=(M, 3)): query points
+        boxes (numpy.ndarray, shape=(N, 6)): normalized boxes
+
+    Returns:
+        hit (numpy.ndarray, shape=(M,), dtype=bool): True if inside any box (inclusive)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    hit = np.zeros(len(points), dtype=bool)
+    if not len(boxes):
+        return hit
+    for chunk in _chunks(len(points), len(boxes)):
+        pts = points[chunk, None, :]
+        inside = (pts >= boxes[None, :, :3]) & (pts <= boxes[None, :, 3:])
+        hit[chunk] = np.any(np.all(inside, axis=2), axis=1)
+    return hit
+
+
+def segments_collide(
+    starts: np.ndarray, ends: np.ndarray, boxes: np.ndarray
+) -> np.ndarray:
+    """segment collision check
+
+    vectorized slab test of many segments against many boxes
+
+    Args:
+        starts (numpy.ndarray, shape=(M, 3)): segment start points
+        ends (numpy.ndarray, shape=(M, 3)): segment end points
+        boxes (numpy.ndarray, shape=(N, 6)): normalized boxes
+
+    Returns:
+        hit (numpy.ndarray, shape=(M,), dtype=bool): True if the segment touches any box
+    """
+    starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+    hit = np.zeros(len(starts), dtype=bool)
+    if not len(boxes):
+        return hit
+    seg_lo, seg_hi = np.minimum(starts, ends), np.maximum(starts, ends)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for chunk in _chunks(len(starts), len(boxes)):
+            # cheap bounding box test first, the slab test only runs on the
+            # (segment, box) pairs whose bounding boxes touch
+            near = np.ones((len(hit[chunk]), len(boxes)), dtype=bool)
+            for axis in range(3):
+                near &= boxes[None, :, axis] <= seg_hi[chunk, None, axis]
+                near &= boxes[None, :, axis + 3] >= seg_lo[chunk, None, axis]
+            seg, box = np.nonzero(near)
+            seg += chunk.start
+            enter, leave = np.zeros(len(seg)), np.ones(len(seg))
+            # one slab at a time, pairs drop out as soon as they miss
+            for axis in range(3):
+                origin = starts[seg, axis]
+                delta = ends[seg, axis] - origin
+                t_lo = (boxes[box, axis] - origin) / delta
+                t_hi = (boxes[box, axis + 3] - origin) / delta
+                # parallel to the slab: the bounding box test put it inside
+                parallel = delta == 0
+                enter = np.maximum(enter, np.where(parallel, -np.inf, np.minimum(t_lo, t_hi)))
+                leave = np.minimum(leave, np.where(parallel, np.inf, np.maximum(t_lo, t_hi)))
+                keep = enter <= leave
+                seg, box, enter, leave = seg[keep], box[keep], enter[keep], leave[keep]
+            hit[seg] = True
+    return hit
+
+
+def occupancy_grid(
+    boundary: np.ndarray,
+    boxes: np.ndarray,
+    shape: Tuple[int, int, int],
+    contain: bool = False,
+) -> np.ndarray:
+    """occupancy grid
+
+    rasterize the obstacles onto a regular grid spanning the boundary
+
+    Args:
+        boundary (numpy.ndarray, shape=(6,)): limits of the world
+        boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+        shape (Tuple[int, int, int]): number of cells along each axis
+        contain (bool): if True mark only cells fully inside a single obstacle,
+                        otherwise mark every cell touched by an obstacle
+
+    Returns:
+        grid (numpy.ndarray, shape=shape, dtype=bool): True where occupied
+
+    Raises:
+        ValueError: if the boundary has no volume or shape is not positive
+    """
+    shape = np.asarray(shape, dtype=int)
+    extent = boundary[3:] - boundary[:3]
+    if np.any(extent <= 0) or np.any(shape <= 0):
+        raise ValueError("grid needs a boundary with volume and a positive shape")
+    cell = extent / shape
+    grid = np.zeros(tuple(shape), dtype=bool)
+    if not len(boxes):
+        return grid
+
+    lo = (boxes[:, :3] - boundary[:3]) / cell
+    hi = (boxes[:, 3:] - boundary[:3]) / cell
+    if contain:
+        first, last = np.ceil(lo), np.floor(hi)
+    else:
+        # inclusive, a box touching a cell face also occupies that cell
+        first, last = np.ceil(lo) - 1, np.floor(hi) + 1
+    first = np.clip(first, 0, shape).astype(int)
+    last = np.clip(last, 0, shape).astype(int)
+    for (i0, j0, k0), (i1, j1, k1) in zip(first, last):
+        grid[i0:i1, j0:j1, k0:k1] = True
+    return grid
+
+
+def points_to_cuboids_distance(points: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """point to box distance
+
+    exact euclidean distance from every point to every box,
+    zero for points inside a box
+
+    Args:
+        points (numpy.ndarray, shape=(M, 3)): query points
+        boxes (numpy.ndarray, shape=(N, 6)): normalized boxes
+
+    Returns:
+        dist (numpy.ndarray, shape=(M, N)): distances
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    gap = np.maximum(
+        np.maximum(boxes[None, :, :3] - points[:, None, :], 0.0),
+        points[:, None, :] - boxes[None, :, 3:],
+    )
+    return np.linalg.norm(gap, axis=2)
@@ -0,0 +1,238 @@
+import numpy as np
+from typing import Optional
+
+from pybotic.utils.collision_utils import segments_collide
+from pybotic.utils.sampling_utils import Seed_Type
+
+
+SHORTCUT_METHODS = ("greedy", "random")
+
+
+def path_length(path: np.ndarray) -> float:
+    """path length
+
+    Args:
+        path (numpy.ndarray, shape=(K, 3)): waypoints
+
+    Returns:
+        length (float): sum of the segment lengths
+    """
+    return float(np.linalg.norm(np.diff(path, axis=0), axis=1).sum())
+
+
+def _cull(boxes: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """boxes touching the bounding box of points
+
+    segments between the points never leave that bounding box
+
+    Args:
+        boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+        points (numpy.ndarray, shape=(M, 3)): segment end points
+
+    Returns:
+        boxes (numpy.ndarray, shape=(N', 6)): boxes that may be hit
+    """
+    lower, upper = points.min(axis=0), points.max(axis=0)
+    return boxes[np.all((boxes[:, :3] <= upper) & (boxes[:, 3:] >= lower), axis=1)]
+
+
+def _visible(path: np.ndarray, boxes: np.ndarray, i: int, targets: np.ndarray) -> np.ndarray:
+    """which targets waypoint i reaches in a straight line
+
+    Args:
+        path (numpy.ndarray, shape=(K, 3)): waypoints
+        boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+        i (int): index of the start waypoint
+        targets (numpy.ndarray, shape=(T,)): indices of the end waypoints
+
+    Returns:
+        free (numpy.ndarray, shape=(T,), dtype=bool): True if collision free
+    """
+    ends = path[targets]
+    boxes = _cull(boxes, np.vstack((path[i], ends)))
+    return ~segments_collide(np.broadcast_to(path[i], ends.shape), ends, boxes)
+
+
+def _greedy_shortcut(path: np.ndarray, boxes: np.ndarray, window: int) -> np.ndarray:
+    """greedy shortcutting
+
+    from every kept waypoint jump to the farthest waypoint that is
+    directly reachable. The lookahead doubles while its last waypoint is
+    reachable, checking one segment per step, then the farthest reachable
+    waypoint of the last doubling is searched back from its end in
+    growing batched calls
+
+    Args:
+        path (numpy.ndarray, shape=(K, 3)): waypoints
+        boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+        window (int): initial lookahead and first batch size
+
+    Returns:
+        path (numpy.ndarray, shape=(K', 3)): shortcut waypoints
+    """
+    last = len(path) - 1
+    keep = [0]
+    i = 0
+    while i < last:
+        # everything up to i + done is reachable, i + size may not be
+        done, size = 0, min(window, last - i)
+        while size < last - i and _visible(path, boxes, i, np.array([i + size]))[0]:
+            done, size = size, min(2 * size, last - i)
+
+        farthest, end, step = i + done, i + size, window
+        while end > i + done:
+            targets = np.arange(max(end - step, i + done) + 1, end + 1)
+            free = np.flatnonzero(_visible(path, boxes, i, targets))
+            if len(free):
+                farthest = int(targets[free[-1]])
+                break
+            end, step = int(targets[0]) - 1, 2 * step
+        # the original segment is kept even if it touches an obstacle
+        farthest = max(farthest, i + 1)
+        keep.append(farthest)
+        i = farthest
+    return path[keep]
+
+
+def _random_shortcut(
+    path: np.ndarray, boxes: np.ndarray, iterations: int, batch: int, seed: Seed_Type
+) -> np.ndarray:
+    """randomized shortcutting
+
+    every iteration draws a batch of random waypoint pairs, checks them in
+    one batched call and applies the largest non overlapping free shortcuts
+
+    Args:
+        path (numpy.ndarray, shape=(K, 3)): waypoints
+        boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+        iterations (int): number of batches
+        batch (int): candidate pairs per batch
+        seed (None, int, numpy.random.Generator): seed for reproducibility
+
+    Returns:
+        path (numpy.ndarray, shape=(K', 3)): shortcut waypoints
+    """
+    rng = np.random.default_rng(seed)
+    for _ in range(iterations):
+        n = len(path)
+        if n < 3:
+            break
+        first = rng.integers(0, n - 2, size=batch)
+        second = rng.integers(first + 2, n)
+        # short paths draw the same pairs many times
+        pairs = np.unique(first * n + second)
+        first, second = pairs // n, pairs % n
+        near = _cull(boxes, path[first.min():second.max() + 1])
+        free = ~segments_collide(path[first], path[second], near)
+        if not free.any():
+            continue
+        first, second = first[free], second[free]
+        order = np.argsort(first - second, kind="stable")  # largest gain first
+
+        used = np.zeros(n, dtype=bool)
+        drop = np.zeros(n, dtype=bool)
+        for a, b in zip(first[order], second[order]):
+            if used[a:b + 1].any():
+                continue
+            used[a:b + 1] = True
+            drop[a + 1:b] = True
+        path = path[~drop]
+    return path
+
+
+def shortcut_path(
+    path: np.ndarray,
+    world,
+    method: str = "greedy",
+    iterations: int = 50,
+    batch: int = 256,
+    window: int = 64,
+    seed: Seed_Type = None,
+) -> np.ndarray:
+    """path shortcutting
+
+    remove redundant waypoints by replacing sub paths with
+    collision free straight segments
+
+    Args:
+        path (numpy.ndarray, shape=(K, 3)): waypoints
+        world (Continous3D_Static): world to check collisions in
+        method (str): "greedy" or "random"
+        iterations (int): batches for the random method
+        batch (int): candidate pairs per batch for the random method
+        window (int): initial lookahead for the greedy method
+        seed (None, int, numpy.random.Generator): seed for the random method
+
+    Returns:
+        path (numpy.ndarray, shape=(K', 3)): shortcut waypoints, same endpoints
+
+    Raises:
+        ValueError: if method is unknown or path is not (K, 3)
+    """
+    if method not in SHORTCUT_METHODS:
+        raise ValueError(f"Invalid method {method}, expected one of {SHORTCUT_METHODS}")
+    path = np.asarray(path, dtype=float)
+    if path.ndim != 2 or path.shape[1] != 3:
+        raise ValueError("Invalid Size")
+    if len(path) < 3:
+        return path.copy()
+
+    # every shortcut stays inside the bounding box of the path
+    boxes = world.get_obstacle_array()
+    lower, upper = path.min(axis=0), path.max(axis=0)
+    boxes = boxes[np.all((boxes[:, :3] <= upper) & (boxes[:, 3:] >= lower), axis=1)]
+    if method == "greedy":
+        return _greedy_shortcut(path, boxes, window)
+    return _random_shortcut(path, boxes, iterations, batch, seed)
+
+
+def resample_path(path: np.ndarray, spacing: float) -> np.ndarray:
+    """path resampling
+
+    subdivide every segment into equal parts no longer than spacing,
+    the original waypoints are kept so the resampled path never
+    cuts a corner of the input
+
+    Args:
+        path (numpy.ndarray, shape=(K, 3)): waypoints
+        spacing (float): maximum distance between consecutive waypoints
+
+    Returns:
+        path (numpy.ndarray, shape=(M, 3)): resampled waypoints
+
+    Raises:
+        ValueError: if spacing is not positive
+    """
+    if spacing <= 0:
+        raise ValueError("spacing must be positive")
+    path = np.asarray(path, dtype=float)
+    if len(path) < 2:
+        return path.copy()
+
+    delta = np.diff(path, axis=0)
+    parts = np.maximum(np.ceil(np.linalg.norm(delta, axis=1) / spacing), 1).astype(int)
+    segment = np.repeat(np.arange(len(delta)), parts)
+    step = np.arange(len(segment)) - np.repeat(np.cumsum(parts) - parts, parts)
+    fraction = (step / parts[segment])[:, None]
+    return np.concatenate((path[segment] + fraction * delta[segment], path[-1:]))
+
+
+def smooth_path(
+    path: np.ndarray, world, spacing: Optional[float] = None, method: str = "greedy", **kwargs
+) -> np.ndarray:
+    """path post processing
+
+    shortcut the path and optionally resample it to uniform spacing
+
+    Args:
+        path (numpy.ndarray, shape=(K, 3)): waypoints
+        world (Continous3D_Static): world to check collisions in
+        spacing (Optional[float]): resample spacing, no resampling if None
+        method (str): shortcutting method, "greedy" or "random"
+        **kwargs: forwarded to shortcut_path
+
+    Returns:
+        path (numpy.ndarray, shape=(M, 3)): processed waypoints
+    """
+    path = shortcut_path(path, world, method=method, **kwargs)
+    return path if spacing is None else resample_path(path, spacing)
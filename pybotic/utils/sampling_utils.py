@@ -0,0 +1,200 @@
+from dataclasses import dataclass
+import numpy as np
+from typing import Callable, Optional, Tuple, Union
+
+from pybotic.utils.collision_utils import (
+    points_in_boundary,
+    points_in_cuboids,
+    occupancy_grid,
+)
+
+
+# Custom types
+Seed_Type = Union[None, int, np.random.Generator]
+
+SAMPLING_MODES = ("batched", "stratified", "goal")
+
+
+@dataclass
+class SamplingStats:
+    """Sampling statistics
+
+    Acceptance bookkeeping of a single sampling call, useful to pick
+    the right mode for a given map
+
+    Args:
+        mode (str): sampling mode used
+        requested (int): number of points asked for
+        drawn (int): number of candidates generated
+        checked (int): number of candidates that needed a collision check
+        accepted (int): number of collision free candidates
+        rounds (int): number of vectorized batches
+    """
+
+    mode: str
+    requested: int = 0
+    drawn: int = 0
+    checked: int = 0
+    accepted: int = 0
+    rounds: int = 0
+
+    @property
+    def acceptance_rate(self) -> float:
+        """fraction of drawn candidates that were free"""
+        return self.accepted / self.drawn if self.drawn else 0.0
+
+
+def _rejection_loop(
+    draw: Callable[[int], Tuple[np.ndarray, np.ndarray]],
+    n: int,
+    stats: SamplingStats,
+    batch_size: Optional[int],
+    max_draws: int,
+) -> np.ndarray:
+    """batched rejection helper
+
+    repeatedly draw vectorized batches until n free points are found,
+    the batch size adapts to the running acceptance rate
+
+    Args:
+        draw (Callable): draw(m) -> (candidates (m, 3), free mask (m,))
+        n (int): number of points needed
+        stats (SamplingStats): statistics to update in place
+        batch_size (Optional[int]): fixed batch size, adaptive if None
+        max_draws (int): give up after this many candidates
+
+    Returns:
+        points (numpy.ndarray, shape=(n, 3)): free points
+
+    Raises:
+        RuntimeError: if max_draws is exceeded
+    """
+    found = []
+    have = 0
+    while have < n:
+        if stats.drawn >= max_draws:
+            raise RuntimeError(
+                f"only {have}/{n} free samples after {stats.drawn} draws"
+            )
+        if batch_size is None:
+            # expect at least 1% acceptance, overshoot a little to avoid extra rounds
+            rate = max(stats.acceptance_rate if stats.rounds else 1.0, 0.01)
+            m = int(np.ceil(1.2 * (n - have) / rate)) + 16
+        else:
+            m = batch_size
+        m = min(m, max_draws - stats.drawn)
+        candidates, free = draw(m)
+        stats.drawn += m
+        stats.rounds += 1
+        stats.accepted += int(free.sum())
+        found.append(candidates[free])
+        have += len(found[-1])
+    return np.concatenate(found)[:n]
+
+
+def sample_free_points(
+    boundary: np.ndarray,
+    boxes: np.ndarray,
+    n: int,
+    mode: str = "batched",
+    seed: Seed_Type = None,
+    goal: Optional[np.ndarray] = None,
+    goal_bias: float = 0.1,
+    goal_sigma: Optional[float] = None,
+    cells: int = 16,
+    batch_size: Optional[int] = None,
+    max_draws: Optional[int] = None,
+) -> Tuple[np.ndarray, SamplingStats]:
+    """free space sampler
+
+    sample collision free points uniformly inside the boundary
+
+    modes:
+        - batched: vectorized rejection sampling over the whole boundary
+        - stratified: spread samples evenly over the cells of a coarse
+                      occupancy grid, skipping fully occupied cells and
+                      only checking cells that touch an obstacle
+        - goal: batched, but a goal_bias fraction of candidates is drawn
+                from a gaussian around the goal
+
+    Args:
+        boundary (numpy.ndarray, shape=(6,)): limits of the world
+        boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+        n (int): number of points to sample
+        mode (str): one of SAMPLING_MODES
+        seed (None, int, numpy.random.Generator): seed for reproducibility
+        goal (numpy.ndarray, shape=(3,)): goal location, used by goal mode
+        goal_bias (float): fraction of candidates drawn near the goal
+        goal_sigma (float): std of the goal gaussian, 5% of the diagonal if None
+        cells (int): grid cells per axis for the stratified mode
+        batch_size (int): fixed candidates per round, adaptive if None
+        max_draws (int): maximum candidates before giving up, 1000 * n if None
+
+    Returns:
+        points (numpy.ndarray, shape=(n, 3)): collision free points
+        stats (SamplingStats): acceptance statistics
+
+    Raises:
+        ValueError: if mode is unknown, goal mode is used without goal
+                    or batch_size is not positive
+        RuntimeError: if not enough free points are found within max_draws
+    """
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"Invalid mode {mode}, expected one of {SAMPLING_MODES}")
+    if mode == "goal" and goal is None:
+        raise ValueError("goal mode needs a goal")
+    if batch_size is not None and batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    rng = np.random.default_rng(seed)
+    boundary = np.asarray(boundary, dtype=float)
+    lower, upper = boundary[:3], boundary[3:]
+    stats = SamplingStats(mode, requested=n)
+    max_draws = 1000 * max(n, 1) if max_draws is None else max_draws
+    if n <= 0:
+        return np.zeros((0, 3)), stats
+
+    def check(points: np.ndarray) -> np.ndarray:
+        stats.checked += len(points)
+        return ~points_in_cuboids(points, boxes)
+
+    if mode == "batched":
+
+        def draw(m: int) -> Tuple[np.ndarray, np.ndarray]:
+            points = rng.uniform(lower, upper, size=(m, 3))
+            return points, check(points)
+
+    elif mode == "goal":
+        goal = np.asarray(goal, dtype=float)
+        if goal_sigma is None:
+            goal_sigma = 0.05 * float(np.linalg.norm(upper - lower))
+
+        def draw(m: int) -> Tuple[np.ndarray, np.ndarray]:
+            points = rng.uniform(lower, upper, size=(m, 3))
+            near = rng.random(m) < goal_bias
+            points[near] = rng.normal(goal, goal_sigma, size=(int(near.sum()), 3))
+            free = points_in_boundary(points, boundary)
+            free[free] = check(points[free])
+            return points, free
+
+    else:  # mode == "stratified":
+        shape = (cells, cells, cells)
+        cell = (upper - lower) / cells
+        blocked = occupancy_grid(boundary, boxes, shape, contain=True)
+        touched = occupancy_grid(boundary, boxes, shape)
+        open_cells = np.flatnonzero(~blocked)
+        if not len(open_cells):
+            raise RuntimeError("every grid cell is occupied")
+
+        def draw(m: int) -> Tuple[np.ndarray, np.ndarray]:
+            # equal share per open cell, the remainder goes to random cells
+            order = rng.permutation(open_cells)
+            picked = order[np.arange(m) % len(order)]
+            index = np.stack(np.unravel_index(picked, shape), axis=1)
+            points = lower + (index + rng.random((m, 3))) * cell
+            free = np.ones(m, dtype=bool)
+            dirty = touched.ravel()[picked]
+            free[dirty] = check(points[dirty])
+            return points, free
+
+    return _rejection_loop(draw, n, stats, batch_size, max_draws), stats
@@ -0,0 +1,322 @@
+from dataclasses import dataclass
+import itertools
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+# 3x3x3 neighbourhood of a grid cell
+_OFFSETS = np.array(list(itertools.product((-1, 0, 1), repeat=3)), dtype=np.int64)
+# spatial hashing primes, no two cells of a 3x3x3 block share a key
+_PRIMES = np.array([73856093, 19349663, 83492791], dtype=np.uint64)
+
+
+def _hash_cells(cells: np.ndarray) -> np.ndarray:
+    """hash cells to keys
+
+    linear in the cell, wrapping around in uint64. Keys of different
+    cells can collide, but not within a 3x3x3 neighbourhood
+
+    Args:
+        cells (numpy.ndarray, shape=(M, 3), dtype=int64): grid cells
+
+    Returns:
+        keys (numpy.ndarray, shape=(M,), dtype=uint64): cell keys
+    """
+    return cells.astype(np.uint64) @ _PRIMES
+
+
+def _expand_ranges(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """range expansion helper
+
+    vectorized equivalent of concatenating range(lo[i], hi[i])
+
+    Args:
+        lo (numpy.ndarray, shape=(M,)): range starts
+        hi (numpy.ndarray, shape=(M,)): range ends (exclusive)
+
+    Returns:
+        owner (numpy.ndarray): index i of the range each position came from
+        position (numpy.ndarray): positions inside the ranges
+    """
+    counts = hi - lo
+    owner = np.repeat(np.arange(len(lo)), counts)
+    offsets = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, lo[owner] + offsets
+
+
+def radius_pairs(
+    points: np.ndarray, radius: float, k: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """radius neighbour search
+
+    find all pairs of points closer than radius using a hashed grid
+    with cells of size radius, so only 27 neighbouring cells are searched.
+    The cells are hashed rather than indexed densely, so the extent of the
+    points over radius is not limited by the grid size
+
+    Args:
+        points (numpy.ndarray, shape=(M, 3)): points to search
+        radius (float): search radius
+        k (Optional[int]): if given keep only the k nearest neighbours of each
+                           point, a pair is kept if either side keeps it
+
+    Returns:
+        i (numpy.ndarray, shape=(P,)): first index of each pair
+        j (numpy.ndarray, shape=(P,)): second index of each pair, i < j
+        dist (numpy.ndarray, shape=(P,)): distance between the pair
+
+    Raises:
+        ValueError: if radius is not positive or too small for the extent
+    """
+    if not radius > 0:
+        raise ValueError("radius must be positive")
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    empty = np.zeros(0, dtype=np.int64)
+    if len(points) < 2:
+        return empty, empty, np.zeros(0)
+
+    cells = (points - points.min(axis=0)) / radius
+    if cells.max() >= 2 ** 62:
+        raise ValueError("radius is too small for the extent of the points")
+    cells = np.floor(cells).astype(np.int64)
+    keys = _hash_cells(cells)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    first, second = [], []
+    for offset in _OFFSETS:
+        neighbour = cells + offset
+        n_keys = _hash_cells(neighbour)
+        lo = np.searchsorted(sorted_keys, n_keys, side="left")
+        hi = np.searchsorted(sorted_keys, n_keys, side="right")
+        owner, position = _expand_ranges(lo, hi)
+        first.append(owner)
+        second.append(order[position])
+    i, j = np.concatenate(first), np.concatenate(second)
+
+    # colliding cells are not adjacent, so their points are farther than radius
+    dist = np.linalg.norm(points[i] - points[j], axis=1)
+    keep = (i != j) & (dist <= radius)
+    i, j, dist = i[keep], j[keep], dist[keep]
+
+    if k is not None:
+        # both directions are present, rank the neighbours of every i
+        ranked = np.lexsort((dist, i))
+        i, j, dist = i[ranked], j[ranked], dist[ranked]
+        starts = np.searchsorted(i, i, side="left")
+        keep = (np.arange(len(i)) - starts) < k
+        i, j, dist = i[keep], j[keep], dist[keep]
+        # direction does not matter anymore, deduplicate undirected pairs
+        i, j = np.minimum(i, j), np.maximum(i, j)
+        _, unique = np.unique(i * len(points) + j, return_index=True)
+        i, j, dist = i[unique], j[unique], dist[unique]
+    else:
+        keep = i < j
+        i, j, dist = i[keep], j[keep], dist[keep]
+    return i, j, dist
+
+
+def _box_distance(points: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """row wise point to box distance
+
+    Args:
+        points (numpy.ndarray, shape=(P, 3)): query points
+        boxes (numpy.ndarray, shape=(P, 6)): one box per point
+
+    Returns:
+        dist (numpy.ndarray, shape=(P,)): distances, zero inside
+    """
+    gap = np.maximum(np.maximum(boxes[:, :3] - points, 0.0), points - boxes[:, 3:])
+    return np.sqrt(np.einsum("ij,ij->i", gap, gap))
+
+
+@dataclass
+class ObstacleIndex:
+    """Bounding volume hierarchy over obstacle boxes
+
+    Array backed binary tree, node i bounds boxes[order[start[i]:start[i] + count[i]]]
+    and internal nodes have their two children at child[i] and child[i] + 1.
+    Queries walk the tree for all points at once and prune every node
+    farther than the current k-th best distance, so the results are exact.
+
+    Args:
+        boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+        names (List[str]): obstacle names, aligned with boxes
+        order (numpy.ndarray, shape=(N,)): box permutation used by the leaves
+        bounds (numpy.ndarray, shape=(n, 6)): node bounds
+        start (numpy.ndarray, shape=(n,)): first entry of the node in order
+        count (numpy.ndarray, shape=(n,)): number of boxes under the node
+        child (numpy.ndarray, shape=(n,)): first child, -1 for leaves
+    """
+
+    boxes: np.ndarray
+    names: List[str]
+    order: np.ndarray
+    bounds: np.ndarray
+    start: np.ndarray
+    count: np.ndarray
+    child: np.ndarray
+
+    @classmethod
+    def build(cls, boxes: np.ndarray, names: Optional[List[str]] = None, leaf_size: int = 8):
+        """build the hierarchy
+
+        median split along the longest axis of the box centers
+
+        Args:
+            boxes (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+            names (Optional[List[str]]): obstacle names, row index if None
+            leaf_size (int): maximum boxes per leaf
+
+        Returns:
+            index (ObstacleIndex): the built index
+        """
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 6)
+        names = [str(i) for i in range(len(boxes))] if names is None else list(names)
+        centers = (boxes[:, :3] + boxes[:, 3:]) / 2
+        order = np.arange(len(boxes))
+        bounds, start, count, child = [None], [0], [0], [-1]
+
+        # (node, first, last) ranges of order still to be processed
+        stack = [(0, 0, len(boxes))]
+        while stack:
+            node, first, last = stack.pop()
+            members = order[first:last]
+            if len(members):
+                bounds[node] = np.concatenate(
+                    (boxes[members, :3].min(axis=0), boxes[members, 3:].max(axis=0))
+                )
+            else:
+                bounds[node] = np.full(6, np.nan)
+            start[node], count[node] = first, last - first
+            if last - first <= leaf_size:
+                continue
+            spread = np.ptp(centers[members], axis=0)
+            axis = int(np.argmax(spread))
+            half = (last - first) // 2
+            split = np.argpartition(centers[members, axis], half)
+            order[first:last] = members[split]
+            child[node] = len(bounds)
+            stack.append((child[node], first, first + half))
+            stack.append((child[node] + 1, first + half, last))
+            bounds.extend([None, None])
+            start.extend([0, 0])
+            count.extend([0, 0])
+            child.extend([-1, -1])
+
+        return cls(
+            boxes,
+            names,
+            order,
+            np.array(bounds).reshape(-1, 6),
+            np.array(start, dtype=np.int64),
+            np.array(count, dtype=np.int64),
+            np.array(child, dtype=np.int64),
+        )
+
+    @classmethod
+    def create_from_world(cls, world, leaf_size: int = 8):
+        """build from a world
+
+        Args:
+            world (Continous3D_Static): world with the obstacles
+            leaf_size (int): maximum boxes per leaf
+
+        Returns:
+            index (ObstacleIndex): the built index
+        """
+        return cls.build(world.get_obstacle_array(), list(world._obstacles), leaf_size)
+
+    def _merge(self, best_d, best_i, query, dist, index) -> None:
+        """keep the k best (distance, box) of every query, in place"""
+        k = best_d.shape[1]
+        touched = np.unique(query)
+        query = np.concatenate((np.repeat(touched, k), query))
+        dist = np.concatenate((best_d[touched].ravel(), dist))
+        index = np.concatenate((best_i[touched].ravel(), index))
+        # a box can be reached twice, drop duplicates but keep the empty slots
+        key = query * (len(self.boxes) + 1) + index + 1
+        _, unique = np.unique(key, return_index=True)
+        unique = unique[index[unique] >= 0]
+        query, dist, index = query[unique], dist[unique], index[unique]
+
+        ranked = np.lexsort((dist, query))
+        query, dist, index = query[ranked], dist[ranked], index[ranked]
+        rank = np.arange(len(query)) - np.searchsorted(query, query, side="left")
+        keep = rank < k
+        best_d[touched] = np.inf
+        best_i[touched] = -1
+        best_d[query[keep], rank[keep]] = dist[keep]
+        best_i[query[keep], rank[keep]] = index[keep]
+
+    def _visit_leaves(self, points, best_d, best_i, query, node) -> None:
+        """exact distances to every box of the given leaves"""
+        first, counts = self.start[node], self.count[node]
+        owner = np.repeat(np.arange(len(node)), counts)
+        position = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(len(owner))
+        boxes = self.order[position]
+        query = query[owner]
+        dist = _box_distance(points[query], self.boxes[boxes])
+        self._merge(best_d, best_i, query, dist, boxes)
+
+    def nearest(self, points: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """k nearest obstacles
+
+        Args:
+            points (numpy.ndarray, shape=(M, 3)): query points
+            k (int): number of obstacles per point
+
+        Returns:
+            dist (numpy.ndarray, shape=(M, k)): sorted distances, inf if missing
+            index (numpy.ndarray, shape=(M, k)): rows of boxes, -1 if missing
+
+        Raises:
+            ValueError: if k is not positive
+        """
+        if k <= 0:
+            raise ValueError("k must be positive")
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        best_d = np.full((len(points), k), np.inf)
+        best_i = np.full((len(points), k), -1, dtype=np.int64)
+        if not len(self.boxes) or not len(points):
+            return best_d, best_i
+
+        # greedy descent towards the point while the subtree still holds
+        # a few times k boxes, its boxes give a tight first bound
+        node = np.zeros(len(points), dtype=np.int64)
+        inner = np.flatnonzero(self.child[node] >= 0)
+        while len(inner):
+            left = self.child[node[inner]]
+            closer = _box_distance(points[inner], self.bounds[left]) <= _box_distance(
+                points[inner], self.bounds[left + 1]
+            )
+            nearer = np.where(closer, left, left + 1)
+            deeper = self.count[nearer] >= 4 * k
+            inner = inner[deeper]
+            node[inner] = nearer[deeper]
+            inner = inner[self.child[node[inner]] >= 0]
+        self._visit_leaves(points, best_d, best_i, np.arange(len(points)), node)
+
+        query = np.arange(len(points))
+        node = np.zeros(len(points), dtype=np.int64)
+        while len(query):
+            bound = _box_distance(points[query], self.bounds[node])
+            keep = bound <= best_d[query, -1]
+            query, node = query[keep], node[keep]
+            leaf = self.child[node] < 0
+            if leaf.any():
+                self._visit_leaves(points, best_d, best_i, query[leaf], node[leaf])
+            query = np.repeat(query[~leaf], 2)
+            node = (self.child[node[~leaf]][:, None] + np.arange(2)).ravel()
+        return best_d, best_i
+
+    def clearance(self, points: np.ndarray) -> np.ndarray:
+        """distance to the closest obstacle
+
+        Args:
+            points (numpy.ndarray, shape=(M, 3)): query points
+
+        Returns:
+            dist (numpy.ndarray, shape=(M,)): distances, zero inside obstacles
+        """
+        return self.nearest(points, 1)[0][:, 0]
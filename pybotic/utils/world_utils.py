@@ -1,14 +1,57 @@
+import asyncio
+import glob
+import itertools
 import os
 import re
 import warnings
 import numpy as np
-from typing import Tuple, Dict, Generator, Optional, Union
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from typing import (
+    AsyncGenerator,
+    Tuple,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
 
 # Custom types
 Map_File_Type = Tuple[
     np.ndarray, Union[Dict[str, np.ndarray], dict], np.ndarray, Optional[np.ndarray]
 ]
+Map_Paths_Type = Union[str, Iterable[str]]
+
+# errors of a single map file that do not abort a bulk load
+LOAD_ERRORS = (SyntaxError, ValueError, KeyError, FileNotFoundError, NotImplementedError)
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+@dataclass
+class MapLoadResult:
+    """Result of loading one map in a bulk load
+
+    Args:
+        file_name (str): path of the map file
+        world_map (Optional[Map_File_Type]): output of load_3d_map_from_file
+        error (Optional[Exception]): error raised while loading, if any
+    """
+
+    file_name: str
+    world_map: Optional[Map_File_Type] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 def load_3d_map_from_file(file_name: str) -> Map_File_Type:
@@ -131,3 +174,159 @@ def load_3d_map_from_txt(f_name: str) -> Map_File_Type:
         goal = res["goal"]
 
     return res["boundary"], obstacles, start, goal
+
+
+def _expand_paths(paths: Map_Paths_Type) -> List[str]:
+    """path expansion helper
+
+    a string without glob characters is a single path, so a missing
+    file is reported instead of matching nothing
+
+    Args:
+        paths (str, Iterable[str]): glob pattern, path or iterable of paths
+
+    Returns:
+        files (List[str]): paths to load
+    """
+    if isinstance(paths, str):
+        if glob.has_magic(paths):
+            return sorted(glob.glob(paths, recursive=True))
+        return [paths]
+    return list(paths)
+
+
+def _load_one(file_name: str) -> MapLoadResult:
+    """load a single map, keeping its error
+
+    Args:
+        file_name (str): Path to 3D world map data
+
+    Returns:
+        result (MapLoadResult): map or error
+    """
+    try:
+        return MapLoadResult(file_name, load_3d_map_from_file(file_name))
+    except LOAD_ERRORS as error:
+        return MapLoadResult(file_name, error=error)
+
+
+def _create_executor(executor: str, max_workers: Optional[int]):
+    """executor helper
+
+    Args:
+        executor (str): "thread" or "process"
+        max_workers (Optional[int]): concurrency level, number of CPUs if None
+
+    Returns:
+        pool (concurrent.futures.Executor): the executor
+        max_workers (int): the resolved concurrency level
+
+    Raises:
+        ValueError: if executor is unknown
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Invalid executor {executor}, expected one of {list(EXECUTORS)}")
+    max_workers = max_workers or os.cpu_count() or 1
+    return EXECUTORS[executor](max_workers=max_workers), max_workers
+
+
+def load_3d_maps_from_files(
+    paths: Map_Paths_Type, max_workers: Optional[int] = None, executor: str = "thread"
+) -> Generator[MapLoadResult, None, None]:
+    """bulk map loader
+
+    load many 3D world maps concurrently, results are yielded as they
+    complete. Errors of a single file are stored in its result instead
+    of aborting the batch. At most max_workers files are in flight, so a
+    consumer that stops early only waits for the files being parsed
+
+    Args:
+        paths (str, Iterable[str]): glob pattern, path or iterable of paths
+        max_workers (Optional[int]): concurrency level, number of CPUs if None
+        executor (str): "thread" or "process"
+
+    Yields:
+        result (MapLoadResult): map or error of one file, in completion order
+
+    Raises:
+        ValueError: if executor is unknown
+    """
+    files = iter(_expand_paths(paths))
+    pool, max_workers = _create_executor(executor, max_workers)
+    pending = set()
+    try:
+        for file_name in itertools.islice(files, max_workers):
+            pending.add(pool.submit(_load_one, file_name))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for file_name in itertools.islice(files, 1):
+                    pending.add(pool.submit(_load_one, file_name))
+                yield future.result()
+    finally:
+        # the consumer may stop early, only wait for the files being parsed
+        for future in pending:
+            future.cancel()
+        pool.shutdown()
+
+
+async def load_3d_maps_async(
+    paths: Map_Paths_Type, max_workers: Optional[int] = None, executor: str = "thread"
+) -> AsyncGenerator[MapLoadResult, None]:
+    """asyncio bulk map loader
+
+    same as load_3d_maps_from_files but as an async generator, the files
+    are parsed in an executor so the event loop is not blocked
+
+    Args:
+        paths (str, Iterable[str]): glob pattern, path or iterable of paths
+        max_workers (Optional[int]): concurrency level, number of CPUs if None
+        executor (str): "thread" or "process"
+
+    Yields:
+        result (MapLoadResult): map or error of one file, in completion order
+
+    Raises:
+        ValueError: if executor is unknown
+    """
+    files = iter(_expand_paths(paths))
+    loop = asyncio.get_event_loop()
+    pool, max_workers = _create_executor(executor, max_workers)
+    pending = set()
+    try:
+        for file_name in itertools.islice(files, max_workers):
+            pending.add(loop.run_in_executor(pool, _load_one, file_name))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                for file_name in itertools.islice(files, 1):
+                    pending.add(loop.run_in_executor(pool, _load_one, file_name))
+                yield future.result()
+    finally:
+        # wait for the files being parsed off the event loop
+        for future in pending:
+            future.cancel()
+        await loop.run_in_executor(None, pool.shutdown)
+
+
+def load_3d_maps(
+    paths: Map_Paths_Type, max_workers: Optional[int] = None, executor: str = "thread"
+) -> Tuple[Dict[str, Map_File_Type], Dict[str, Exception]]:
+    """bulk map loader, collected
+
+    Args:
+        paths (str, Iterable[str]): glob pattern, path or iterable of paths
+        max_workers (Optional[int]): concurrency level, number of CPUs if None
+        executor (str): "thread" or "process"
+
+    Returns:
+        maps (Dict[str, Map_File_Type]): loaded maps by path
+        errors (Dict[str, Exception]): errors by path
+    """
+    maps, errors = {}, {}
+    for result in load_3d_maps_from_files(paths, max_workers, executor):
+        if result.ok:
+            maps[result.file_name] = result.world_map
+        else:
+            errors[result.file_name] = result.error
+    return maps, errors
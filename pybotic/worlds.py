@@ -1,12 +1,19 @@
 from abc import ABC, abstractmethod
+import hashlib
 from dataclasses import dataclass, field
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from typeguard import typechecked, check_type
 
 from pybotic.utils.world_utils import load_3d_map_from_file
+from pybotic.utils.collision_utils import cuboid_to_array, obstacles_to_array
+from pybotic.utils.sampling_utils import sample_free_points, SamplingStats, Seed_Type
+from pybotic.utils.spatial_utils import ObstacleIndex
 from pybotic.geometry import Point3D, Cuboid, point, shape
 
+# attributes of World that are not part of its state
+_INTERNAL = ("_cache", "_version")
+
 
 def obstacle_creator() -> Dict[str, Cuboid]:
     return {}
@@ -16,6 +23,11 @@ def point_creator() -> Point3D:
     return Point3D(0, 0, 0)
 
 
+def _read_only(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
 @dataclass
 class World(ABC):
     """Abstract World class
@@ -40,6 +52,10 @@ class World(ABC):
     _obstacles: Optional[Dict[str, shape]] = field(default=None)
     _start: Optional[point] = field(default=None)
     _goal: Optional[point] = field(default=None)
+    _robot_pose: Optional[point] = field(default=None, init=False, repr=False, compare=False)
+    # derived data of the static geometry, not part of the state
+    _cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _version: int = field(default=0, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Validate inputs
@@ -109,8 +125,38 @@ class World(ABC):
             content (any): content associated with name
         """
         for name in self.__dict__:
+            if name in _INTERNAL:
+                continue
             yield name[1:], self.__dict__[name]
 
+    @property
+    def version(self) -> int:
+        """counter bumped by invalidate(), cheap change detection"""
+        return self._version
+
+    def invalidate(self) -> None:
+        """Drop derived data
+
+        the world is static, so arrays and indices derived from the
+        boundary and obstacles are cached. Call this after editing them
+        """
+        self._cache.clear()
+        self._version += 1
+
+    def _cached(self, key: str, create):
+        """cache helper
+
+        Args:
+            key (str): name of the derived data
+            create (Callable): creates the data if not cached
+
+        Returns:
+            value (any): cached value
+        """
+        if key not in self._cache:
+            self._cache[key] = create()
+        return self._cache[key]
+
 
 @dataclass
 class Continous3D_Static(World):
@@ -162,6 +208,129 @@ class Continous3D_Static(World):
         renders the world, but currently todo
         """
 
+    def get_boundary_array(self) -> np.ndarray:
+        """Boundary as array
+
+        cached, read only
+
+        Returns:
+            boundary (numpy.ndarray, shape=(6,)): normalized limits of the world
+        """
+        return self._cached(
+            "boundary", lambda: _read_only(cuboid_to_array(self._boundary))
+        )
+
+    def get_obstacle_array(self) -> np.ndarray:
+        """Obstacles as array
+
+        rows follow the order of the obstacle dictionary, cached, read only
+
+        Returns:
+            obstacles (numpy.ndarray, shape=(N, 6)): normalized obstacle bounds
+        """
+        return self._cached(
+            "obstacles", lambda: _read_only(obstacles_to_array(self._obstacles))
+        )
+
+    def fingerprint(self) -> str:
+        """Static geometry fingerprint
+
+        hash of boundary and obstacles, used to tell if data derived
+        from the world (roadmaps, caches) is still valid
+
+        Returns:
+            digest (str): hex digest
+        """
+        digest = hashlib.sha1(self.get_boundary_array().tobytes())
+        digest.update(self.get_obstacle_array().tobytes())
+        return digest.hexdigest()
+
+    def sample_free(
+        self, n: int, mode: str = "batched", seed: Seed_Type = None, **kwargs
+    ) -> Tuple[np.ndarray, SamplingStats]:
+        """Sample free space
+
+        sample collision free points inside the boundary,
+        goal mode biases towards the goal of the world
+
+        Args:
+            n (int): number of points
+            mode (str): "batched", "stratified" or "goal"
+            seed (None, int, numpy.random.Generator): seed for reproducibility
+            **kwargs: forwarded to sample_free_points
+
+        Returns:
+            points (numpy.ndarray, shape=(n, 3)): collision free points
+            stats (SamplingStats): acceptance statistics
+        """
+        kwargs.setdefault("goal", np.asarray(tuple(self._goal), dtype=float))
+        return sample_free_points(
+            self.get_boundary_array(),
+            self.get_obstacle_array(),
+            n,
+            mode=mode,
+            seed=seed,
+            **kwargs,
+        )
+
+    def _query_points(self, points: Optional[np.ndarray]) -> np.ndarray:
+        """query point helper
+
+        Args:
+            points (Optional[numpy.ndarray]): (M, 3) points, robot pose if None
+
+        Returns:
+            points (numpy.ndarray, shape=(M, 3)): query points
+        """
+        if points is None:
+            points = tuple(self._robot_pose)
+        return np.asarray(points, dtype=float).reshape(-1, 3)
+
+    def get_obstacle_index(self) -> ObstacleIndex:
+        """Obstacles as a bounding volume hierarchy
+
+        cached like the obstacle array, rebuilt after invalidate()
+
+        Returns:
+            index (ObstacleIndex): index over the obstacles, rows follow
+                                   the order of the obstacle dictionary
+        """
+        return self._cached("index", lambda: ObstacleIndex.create_from_world(self))
+
+    def clearance(self, points: Optional[np.ndarray] = None) -> np.ndarray:
+        """Clearance to the closest obstacle
+
+        Args:
+            points (Optional[numpy.ndarray]): (M, 3) points, robot pose if None
+
+        Returns:
+            dist (numpy.ndarray, shape=(M,)): distances, zero inside obstacles
+        """
+        return self.get_obstacle_index().clearance(self._query_points(points))
+
+    def nearest_obstacles(
+        self, points: Optional[np.ndarray] = None, k: int = 1
+    ) -> Tuple[np.ndarray, List[List[Optional[str]]]]:
+        """k nearest obstacles
+
+        Args:
+            points (Optional[numpy.ndarray]): (M, 3) points, robot pose if None
+            k (int): number of obstacles per point
+
+        Returns:
+            dist (numpy.ndarray, shape=(M, k)): sorted distances, inf if missing
+            names (List[List[Optional[str]]]): obstacle names, None if missing
+
+        Raises:
+            ValueError: if k is not positive
+        """
+        index = self.get_obstacle_index()
+        dist, rows = index.nearest(self._query_points(points), k)
+        names = [
+            [index.names[row] if row >= 0 else None for row in line] for line in rows
+        ]
+        return dist, names
+
     @typechecked
     def update_state(self, new_robot_pose: Point3D) -> None:
         """Update the state of the world
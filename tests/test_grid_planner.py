@@ -0,0 +1,106 @@
+from pybotic.worlds import Continous3D_Static
+from pybotic.geometry import Point3D, Cuboid
+from pybotic.planners.grid import GridPlanner
+from pybotic.utils.collision_utils import segments_collide
+
+import unittest
+import numpy as np
+
+
+class TestGridPlanner(unittest.TestCase):
+    """Tester for the grid planner and its cost-to-go cache
+
+    test covered:
+        - planning around obstacles
+        - start and goal next to an obstacle
+        - cache hits, LRU eviction and memory
+        - invalidation when the world changes
+        - invalid inputs
+    """
+
+    def setUp(self) -> None:
+        """initializes test object
+
+        a 10x10x10 world with a wall that has a gap at the top
+        """
+        self.world = Continous3D_Static(
+            Cuboid(0, 0, 0, 10, 10, 10),
+            {"wall": Cuboid(4, 0, 0, 6, 10, 7)},
+            Point3D(1, 5, 1),
+            Point3D(9, 5, 1),
+        )
+        self.planner = GridPlanner(self.world, 0.5, cache_size=2)
+
+    def test_plan(self) -> None:
+        """path is collision free and matches the cost-to-go"""
+        path = self.planner.plan()
+        np.testing.assert_array_equal(path[0], [1, 5, 1])
+        np.testing.assert_array_equal(path[-1], [9, 5, 1])
+        boxes = self.world.get_obstacle_array()
+        self.assertFalse(segments_collide(path[:-1], path[1:], boxes).any())
+        self.assertTrue(np.all(path[:, 2].max() > 7))
+
+        field = self.planner.cost_to_go(self.world._goal)
+        self.assertEqual(field.shape, (20, 20, 20))
+        self.assertEqual(field[18, 10, 2], 0)
+        length = np.linalg.norm(np.diff(path[1:-1], axis=0), axis=1).sum()
+        self.assertAlmostEqual(length, field[2, 10, 2], places=4)
+        # inside the wall
+        self.assertTrue(np.isinf(field[10, 10, 2]))
+
+    def test_near_wall(self) -> None:
+        """endpoints in cells that only touch an obstacle are moved"""
+        goal = Point3D(6.2, 5, 1)
+        path = self.planner.plan(goal=goal)
+        self.assertIsNotNone(path)
+        np.testing.assert_array_equal(path[-1], [6.2, 5, 1])
+        boxes = self.world.get_obstacle_array()
+        self.assertFalse(segments_collide(path[:-1], path[1:], boxes).any())
+        # the field belongs to a free cell next to the blocked one
+        field = self.planner.cost_to_go(goal)
+        self.assertEqual(np.argwhere(field == 0)[0, 0], 13)
+        path = self.planner.plan(Point3D(3.8, 5, 1), goal)
+        np.testing.assert_array_equal(path[0], [3.8, 5, 1])
+        self.assertFalse(segments_collide(path[:-1], path[1:], boxes).any())
+
+    def test_cache(self) -> None:
+        """hits, LRU eviction and reported memory"""
+        goals = [Point3D(9, 5, 1), Point3D(9, 9, 9), Point3D(1, 1, 9)]
+        starts = [Point3D(1, 1, 1), Point3D(2, 8, 3), Point3D(1, 9, 1)]
+        for start in starts:
+            self.planner.plan(start, goals[0])
+        stats = self.planner.stats
+        self.assertEqual((stats.hits, stats.misses), (2, 1))
+        self.assertAlmostEqual(stats.hit_rate, 2 / 3)
+
+        self.planner.plan(starts[0], goals[1])
+        self.planner.plan(starts[0], goals[2])
+        self.assertEqual((stats.evictions, stats.entries), (1, 2))
+        self.assertEqual(stats.memory_bytes, 2 * 22 ** 3 * 4)
+        # goals[0] was the least recently used
+        self.planner.plan(starts[0], goals[0])
+        self.assertEqual(stats.misses, 4)
+
+        # memory limit keeps a single field
+        planner = GridPlanner(self.world, 0.5, max_cache_bytes=22 ** 3 * 4)
+        for goal in goals:
+            planner.plan(starts[0], goal)
+        self.assertEqual(planner.stats.entries, 1)
+
+    def test_invalidation(self) -> None:
+        """changing the world clears the cache"""
+        self.planner.plan()
+        self.world._obstacles["wall"] = Cuboid(4, 0, 0, 6, 10, 10)
+        self.world.invalidate()
+        self.assertIsNone(self.planner.plan())
+        stats = self.planner.stats
+        self.assertEqual((stats.invalidations, stats.misses, stats.entries), (1, 2, 1))
+
+    def test_invalid(self) -> None:
+        """invalid inputs"""
+        with self.assertRaises(ValueError):
+            GridPlanner(self.world, 0)
+        with self.assertRaises(ValueError):
+            self.planner.plan(Point3D(-1, 0, 0))
+        # start inside an obstacle
+        self.assertIsNone(self.planner.plan(Point3D(5, 5, 5)))
@@ -0,0 +1,96 @@
+from pybotic.worlds import Continous3D_Static
+from pybotic.geometry import Point3D, Cuboid
+from pybotic.octree import Octree, FREE, OCCUPIED, MIXED
+from pybotic.utils.collision_utils import points_in_boundary, points_in_cuboids
+
+import unittest
+import numpy as np
+
+
+class TestOctree(unittest.TestCase):
+    """Tester for the occupancy octree
+
+    test covered:
+        - structure
+        - point occupancy against brute force
+        - box queries
+        - traversal
+    """
+
+    def setUp(self) -> None:
+        """initializes test object
+
+        a non cubic world with cell aligned and unaligned obstacles
+        """
+        self.world = Continous3D_Static(
+            Cuboid(0, 0, 0, 16, 8, 4),
+            {
+                "aligned": Cuboid(0, 0, 0, 8, 8, 4),
+                "unaligned": Cuboid(10.3, 2.2, 0.7, 13.9, 7.1, 3.3),
+            },
+            Point3D(1, 7, 1),
+            Point3D(15, 1, 1),
+        )
+        self.tree = Octree.create_from_world(self.world, 0.25)
+
+    def test_structure(self) -> None:
+        """levels, child layout and reporting"""
+        tree = self.tree
+        self.assertEqual(tree.depth, 6)
+        self.assertEqual(tree.size, 16)
+        self.assertEqual(tree.level_offsets[-1], tree.node_count)
+        mixed = np.flatnonzero(tree.state == MIXED)
+        self.assertTrue(np.all(tree.child[mixed] >= 0))
+        self.assertTrue(np.all(tree.child[tree.state != MIXED] == -1))
+        self.assertGreater(tree.memory_bytes, tree.node_count)
+        # the aligned obstacle fills the in-boundary part of a root octant
+        self.assertEqual(tree.state[tree.child[0]], OCCUPIED)
+
+    def test_points(self) -> None:
+        """point occupancy matches the obstacles away from cell edges"""
+        points = np.random.default_rng(0).uniform([-1, -1, -1], [17, 9, 5], (20000, 3))
+        expected = points_in_cuboids(points, self.world.get_obstacle_array())
+        expected |= ~points_in_boundary(points, self.world.get_boundary_array())
+        occupied = self.tree.is_occupied(points)
+        # only cells touching an obstacle surface may be conservative
+        self.assertTrue(np.all(occupied[expected]))
+        extra = points[occupied & ~expected]
+        near = np.all((extra > [10.0, 2.0, 0.5]) & (extra < [14.0, 7.25, 3.5]), axis=1)
+        near |= (extra[:, 0] >= 8) & (extra[:, 0] < 8.25)
+        self.assertTrue(np.all(near))
+
+        # points on the faces are occupied, like the inclusive collision helpers
+        faces = np.array(
+            [[8, 4, 2], [13.9, 5, 2], [12, 7.1, 2], [12, 5, 3.3], [10.3, 2.2, 0.7]],
+            dtype=float,
+        )
+        self.assertTrue(points_in_cuboids(faces, self.world.get_obstacle_array()).all())
+        self.assertTrue(self.tree.is_occupied(faces).all())
+
+    def test_boxes(self) -> None:
+        """box queries"""
+        boxes = np.array(
+            [
+                [1, 1, 0.5, 2, 2, 1.5],  # inside aligned
+                [8.5, 1, 1, 9.5, 2, 2],  # free
+                [7, 3, 1, 9, 5, 1.5],  # partially
+                [15, 7, 3, 17, 8, 4],  # outside the boundary
+            ],
+            dtype=float,
+        )
+        np.testing.assert_array_equal(
+            self.tree.query_boxes(boxes), [OCCUPIED, FREE, MIXED, MIXED]
+        )
+
+    def test_traversal(self) -> None:
+        """coarse to fine traversal and cut leaves cover the root"""
+        levels = list(self.tree.levels())
+        self.assertEqual(levels[0][0], 0)
+        np.testing.assert_array_equal(levels[0][1][0], [0, 0, 0, 16, 16, 16])
+        for cut in (1, 3, None):
+            bounds, _ = self.tree.leaves(cut)
+            volume = np.prod(bounds[:, 3:] - bounds[:, :3], axis=1).sum()
+            self.assertAlmostEqual(volume, 16 ** 3)
+
+        with self.assertRaises(ValueError):
+            Octree.create_from_world(self.world, 0)
@@ -0,0 +1,112 @@
+from pybotic.worlds import Continous3D_Static
+from pybotic.geometry import Point3D, Cuboid
+from pybotic.utils.collision_utils import points_in_cuboids, segments_collide
+from pybotic.utils.path_utils import (
+    path_length,
+    shortcut_path,
+    resample_path,
+    smooth_path,
+)
+
+import time
+import unittest
+import numpy as np
+
+
+class TestPathUtils(unittest.TestCase):
+    """Tester for path post processing
+
+    test covered:
+        - greedy and random shortcutting
+        - speed on a dense map
+        - resampling
+        - invalid inputs
+    """
+
+    def setUp(self) -> None:
+        """initializes test object
+
+        a wall in the middle and a dense path going over it
+        """
+        self.world = Continous3D_Static(
+            Cuboid(0, 0, 0, 10, 10, 10),
+            {"wall": Cuboid(4, 0, 0, 6, 10, 7)},
+            Point3D(1, 5, 1),
+            Point3D(9, 5, 1),
+        )
+        corners = np.array([[1, 5, 1], [1, 5, 8], [9, 5, 8], [9, 5, 1]], dtype=float)
+        self.path = resample_path(corners, 0.01)
+        self.boxes = self.world.get_obstacle_array()
+
+    def check_valid(self, path: np.ndarray) -> None:
+        """same endpoints and collision free"""
+        np.testing.assert_array_equal(path[0], self.path[0])
+        np.testing.assert_array_equal(path[-1], self.path[-1])
+        self.assertFalse(segments_collide(path[:-1], path[1:], self.boxes).any())
+
+    def test_greedy(self) -> None:
+        """greedy shortcutting of a long path"""
+        self.assertGreater(len(self.path), 2000)
+        path = shortcut_path(self.path, self.world)
+        self.check_valid(path)
+        self.assertLessEqual(len(path), 5)
+        self.assertLess(path_length(path), path_length(self.path))
+
+        # a straight path collapses to its endpoints
+        straight = resample_path(np.array([[1, 1, 8], [9, 9, 9]], dtype=float), 0.001)
+        np.testing.assert_array_equal(
+            shortcut_path(straight, self.world), straight[[0, -1]]
+        )
+
+    def test_random(self) -> None:
+        """random shortcutting is valid and reproducible"""
+        path = shortcut_path(self.path, self.world, method="random", seed=0)
+        self.check_valid(path)
+        self.assertLess(len(path), len(self.path))
+        again = shortcut_path(self.path, self.world, method="random", seed=0)
+        np.testing.assert_array_equal(path, again)
+
+    def test_dense(self) -> None:
+        """10k waypoints through thousands of obstacles in milliseconds"""
+        rng = np.random.default_rng(0)
+        t = np.linspace(0, 1, 10000)[:, None]
+        path = 5 + 90 * t + np.sin(200 * t) * np.array([3, -3, 0])
+        lower = rng.uniform(0, 98, size=(5000, 3))
+        boxes = np.concatenate((lower, lower + rng.uniform(0.2, 2, size=(5000, 3))), axis=1)
+        # keep the boxes clear of the path with a margin wider than its spacing
+        grown = boxes + np.array([-0.1, -0.1, -0.1, 0.1, 0.1, 0.1])
+        boxes = boxes[[not points_in_cuboids(path, box[None]).any() for box in grown]]
+        world = Continous3D_Static(
+            Cuboid(0, 0, 0, 100, 100, 100),
+            {f"box_{n}": Cuboid(*box) for n, box in enumerate(boxes.tolist())},
+        )
+        for method, limit in (("greedy", 0.5), ("random", 2.0)):
+            start = time.perf_counter()
+            short = shortcut_path(path, world, method=method, seed=0)
+            self.assertLess(time.perf_counter() - start, limit)
+            self.assertLess(len(short), 100)
+            self.assertFalse(
+                segments_collide(short[:-1], short[1:], world.get_obstacle_array()).any()
+            )
+
+    def test_resample(self) -> None:
+        """resampling keeps corners and bounds the spacing"""
+        corners = np.array([[0, 0, 0], [1, 0, 0], [1, 2.5, 0]], dtype=float)
+        path = resample_path(corners, 0.5)
+        self.assertEqual(len(path), 1 + 2 + 5)
+        self.assertTrue(np.all(np.linalg.norm(np.diff(path, axis=0), axis=1) <= 0.5 + 1e-12))
+        self.assertTrue(any(np.array_equal(p, corners[1]) for p in path))
+
+        path = smooth_path(self.path, self.world, spacing=0.5)
+        self.check_valid(path)
+
+    def test_invalid(self) -> None:
+        """invalid inputs"""
+        with self.assertRaises(ValueError):
+            shortcut_path(self.path, self.world, method="invalid")
+        with self.assertRaises(ValueError):
+            shortcut_path(self.path[:, :2], self.world)
+        with self.assertRaises(ValueError):
+            resample_path(self.path, 0)
+        # short paths are returned as is
+        self.assertEqual(len(shortcut_path(self.path[:2], self.world)), 2)
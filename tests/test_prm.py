@@ -0,0 +1,122 @@
+from pybotic.worlds import Continous3D_Static
+from pybotic.geometry import Point3D, Cuboid
+from pybotic.planners.prm import Roadmap, roadmap_path
+from pybotic.utils.collision_utils import segments_collide
+from pybotic.utils.spatial_utils import radius_pairs
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+
+class TestRoadmap(unittest.TestCase):
+    """Tester for the probabilistic roadmap
+
+    test covered:
+        - neighbour search
+        - building and querying
+        - save / load next to the map
+        - world mismatch
+    """
+
+    def setUp(self) -> None:
+        """initializes test object
+
+        a 10x10x10 world with a wall that has a gap at the top
+        """
+        self.world = Continous3D_Static(
+            Cuboid(0, 0, 0, 10, 10, 10),
+            {"wall": Cuboid(4, 0, 0, 6, 10, 7)},
+            Point3D(1, 5, 1),
+            Point3D(9, 5, 1),
+        )
+        self.roadmap = Roadmap.build(self.world, 400, seed=0)
+
+    def test_radius_pairs(self) -> None:
+        """hashed grid search matches brute force"""
+        points = np.random.default_rng(0).uniform(0, 10, size=(300, 3))
+        i, j, dist = radius_pairs(points, 1.5)
+        full = np.linalg.norm(points[:, None] - points[None], axis=2)
+        expected = np.argwhere(np.triu(full <= 1.5, k=1))
+        self.assertEqual(
+            set(zip(i.tolist(), j.tolist())), set(map(tuple, expected.tolist()))
+        )
+        np.testing.assert_allclose(dist, full[i, j])
+
+        # far apart points with a tiny radius do not need a dense grid
+        far = np.array([[0, 0, 0], [1e4, 1e4, 1e4], [1e4, 1e4, 1e4 + 5e-4]])
+        i, j, _ = radius_pairs(far, 1e-3)
+        self.assertEqual((i.tolist(), j.tolist()), ([1], [2]))
+        with self.assertRaises(ValueError):
+            radius_pairs(points, 0)
+
+        # k nearest keeps at most k neighbours chosen by each node
+        i, j, _ = radius_pairs(points, 1.5, k=2)
+        self.assertTrue(np.all(i < j))
+        self.assertLessEqual(len(i), 2 * len(points))
+
+    def test_build(self) -> None:
+        """CSR structure is symmetric and edges are collision free"""
+        roadmap = self.roadmap
+        self.assertEqual(roadmap.n_nodes, 400)
+        self.assertEqual(roadmap.indptr[-1], len(roadmap.indices))
+        src = np.repeat(np.arange(roadmap.n_nodes), np.diff(roadmap.indptr))
+        edges = set(zip(src.tolist(), roadmap.indices.tolist()))
+        self.assertEqual(edges, {(b, a) for a, b in edges})
+        boxes = self.world.get_obstacle_array()
+        self.assertFalse(
+            segments_collide(roadmap.nodes[src], roadmap.nodes[roadmap.indices], boxes).any()
+        )
+
+    def test_query(self) -> None:
+        """path goes over the wall without collisions"""
+        path = self.roadmap.query(self.world)
+        self.assertIsNotNone(path)
+        np.testing.assert_array_equal(path[0], [1, 5, 1])
+        np.testing.assert_array_equal(path[-1], [9, 5, 1])
+        boxes = self.world.get_obstacle_array()
+        self.assertFalse(segments_collide(path[:-1], path[1:], boxes).any())
+
+        # start defaults to the robot pose, like GridPlanner.plan
+        self.world.update_state(Point3D(2, 5, 2))
+        np.testing.assert_array_equal(self.roadmap.query(self.world)[0], [2, 5, 2])
+
+        # direct line of sight
+        path = self.roadmap.query(self.world, Point3D(1, 1, 1), Point3D(3, 3, 3))
+        self.assertEqual(len(path), 2)
+
+        # enclosed goal
+        enclosed = Continous3D_Static(
+            Cuboid(0, 0, 0, 10, 10, 10),
+            {"wall": Cuboid(4, 0, 0, 6, 10, 10)},
+            Point3D(1, 5, 1),
+            Point3D(9, 5, 1),
+        )
+        self.assertIsNone(Roadmap.build(enclosed, 200, seed=0).query(enclosed))
+
+    def test_save_load(self) -> None:
+        """roadmaps round trip next to the map file"""
+        folder = tempfile.mkdtemp()
+        try:
+            map_file = os.path.join(folder, "site.txt")
+            self.assertEqual(roadmap_path(map_file), os.path.join(folder, "site.prm.npz"))
+
+            built = Roadmap.load_or_build(self.world, map_file, 100, seed=0)
+            self.assertTrue(os.path.isfile(roadmap_path(map_file)))
+            loaded = Roadmap.load(roadmap_path(map_file), self.world)
+            np.testing.assert_array_equal(built.nodes, loaded.nodes)
+            np.testing.assert_array_equal(built.indices, loaded.indices)
+            self.assertEqual(built.fingerprint, loaded.fingerprint)
+
+            other = Continous3D_Static(Cuboid(0, 0, 0, 10, 10, 10))
+            with self.assertRaises(ValueError):
+                Roadmap.load(roadmap_path(map_file), other)
+            rebuilt = Roadmap.load_or_build(other, map_file, 50, seed=0)
+            self.assertEqual(rebuilt.fingerprint, other.fingerprint())
+        finally:
+            shutil.rmtree(folder)
+
+        with self.assertRaises(FileNotFoundError):
+            Roadmap.load("invalid")
@@ -0,0 +1,103 @@
+from pybotic.worlds import Continous3D_Static
+from pybotic.geometry import Point3D, Cuboid
+from pybotic.utils.collision_utils import (
+    points_in_cuboids,
+    segments_collide,
+    occupancy_grid,
+)
+from pybotic.utils.sampling_utils import sample_free_points
+
+import unittest
+import numpy as np
+
+
+class TestSampling(unittest.TestCase):
+    """Tester for free space sampling
+
+    test covered:
+        - collision helpers
+        - every sampling mode
+        - reproducibility
+        - invalid inputs
+    """
+
+    def setUp(self) -> None:
+        """initializes test object
+
+        a 10x10x10 world with a wall splitting it along x
+        """
+        self.boundary = np.array([0, 0, 0, 10, 10, 10], dtype=float)
+        self.boxes = np.array([[4, 0, 0, 6, 10, 8]], dtype=float)
+        self.world = Continous3D_Static(
+            Cuboid(*self.boundary.tolist()),
+            {"wall": Cuboid(*self.boxes[0].tolist())},
+            Point3D(1, 1, 1),
+            Point3D(9, 9, 1),
+        )
+
+    def test_collision_helpers(self) -> None:
+        """collision primitives
+
+        inclusive point checks, slab segment checks and rasterization
+        """
+        points = np.array([[5, 5, 5], [4, 0, 0], [1, 1, 1]], dtype=float)
+        np.testing.assert_array_equal(
+            points_in_cuboids(points, self.boxes), [True, True, False]
+        )
+        starts = np.array([[1, 5, 5], [1, 5, 9], [1, 1, 1]], dtype=float)
+        ends = np.array([[9, 5, 5], [9, 5, 9], [3, 1, 1]], dtype=float)
+        np.testing.assert_array_equal(
+            segments_collide(starts, ends, self.boxes), [True, False, False]
+        )
+        grid = occupancy_grid(self.boundary, self.boxes, (10, 10, 10))
+        full = occupancy_grid(self.boundary, self.boxes, (10, 10, 10), contain=True)
+        self.assertTrue(grid[3:7, :, :9].all())
+        self.assertTrue(full[4:6, :, :8].all())
+        self.assertEqual(full.sum(), 2 * 10 * 8)
+
+    def test_modes(self) -> None:
+        """every mode returns free points inside the boundary"""
+        for mode in ("batched", "stratified", "goal"):
+            points, stats = self.world.sample_free(500, mode=mode, seed=0)
+            self.assertEqual(points.shape, (500, 3))
+            self.assertFalse(points_in_cuboids(points, self.boxes).any())
+            self.assertTrue(np.all(points >= 0) and np.all(points <= 10))
+            self.assertGreaterEqual(stats.accepted, 500)
+            self.assertGreater(stats.acceptance_rate, 0)
+
+        # stratified skips the fully occupied cells
+        _, stats = self.world.sample_free(500, mode="stratified", seed=0)
+        self.assertLess(stats.checked, stats.drawn)
+
+    def test_reproducible(self) -> None:
+        """same seed, same points"""
+        first, _ = self.world.sample_free(100, seed=42)
+        second, _ = self.world.sample_free(100, seed=42)
+        np.testing.assert_array_equal(first, second)
+
+    def test_invalid(self) -> None:
+        """invalid inputs and impossible requests"""
+        with self.assertRaises(ValueError):
+            sample_free_points(self.boundary, self.boxes, 10, mode="invalid")
+        with self.assertRaises(ValueError):
+            sample_free_points(self.boundary, self.boxes, 10, mode="goal")
+        with self.assertRaises(ValueError):
+            sample_free_points(self.boundary, self.boxes, 10, batch_size=0)
+        with self.assertRaises(RuntimeError):
+            sample_free_points(self.boundary, self.boundary[None], 10, max_draws=100)
+
+    def test_world_arrays(self) -> None:
+        """obstacle arrays are cached until the world is invalidated"""
+        boxes = self.world.get_obstacle_array()
+        np.testing.assert_array_equal(boxes, self.boxes)
+        self.assertIs(boxes, self.world.get_obstacle_array())
+        self.assertFalse(boxes.flags.writeable)
+        # caches are not part of the state
+        self.assertEqual(
+            set(self.world()), {"boundary", "obstacles", "start", "goal", "robot_pose"}
+        )
+
+        self.world._obstacles["box"] = Cuboid(2, 2, 2, 1, 1, 1)
+        self.world.invalidate()
+        self.assertEqual(self.world.version, 1)
+        np.testing.assert_array_equal(self.world.get_obstacle_array()[1], [1, 1, 1, 2, 2, 2])
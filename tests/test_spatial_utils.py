@@ -0,0 +1,72 @@
+from pybotic.worlds import Continous3D_Static
+from pybotic.geometry import Point3D, Cuboid
+from pybotic.utils.collision_utils import points_to_cuboids_distance
+from pybotic.utils.spatial_utils import ObstacleIndex
+
+import unittest
+import numpy as np
+
+
+class TestObstacleIndex(unittest.TestCase):
+    """Tester for nearest obstacle queries
+
+    test covered:
+        - exact against brute force
+        - world clearance and names
+        - empty worlds
+    """
+
+    def setUp(self) -> None:
+        """initializes test object
+
+        random boxes in a 100^3 world
+        """
+        rng = np.random.default_rng(0)
+        lo = rng.uniform(0, 100, (500, 3))
+        self.boxes = np.concatenate((lo, lo + rng.uniform(0.1, 5, (500, 3))), axis=1)
+        self.points = rng.uniform(-10, 110, (300, 3))
+        self.index = ObstacleIndex.build(self.boxes)
+
+    def test_exact(self) -> None:
+        """k nearest matches brute force"""
+        brute = points_to_cuboids_distance(self.points, self.boxes)
+        for k in (1, 5, 20):
+            dist, rows = self.index.nearest(self.points, k)
+            np.testing.assert_allclose(dist, np.sort(brute, axis=1)[:, :k])
+            np.testing.assert_allclose(np.take_along_axis(brute, rows, axis=1), dist)
+        np.testing.assert_allclose(self.index.clearance(self.points), brute.min(axis=1))
+
+        # more neighbours than boxes
+        dist, rows = ObstacleIndex.build(self.boxes[:3]).nearest(self.points, 5)
+        self.assertTrue(np.all(np.isinf(dist[:, 3:])) and np.all(rows[:, 3:] == -1))
+        for k in (0, -1):
+            with self.assertRaises(ValueError):
+                ObstacleIndex.build(self.boxes).nearest(self.points, k)
+
+    def test_world(self) -> None:
+        """world queries use the robot pose and obstacle names"""
+        world = Continous3D_Static(
+            Cuboid(0, 0, 0, 10, 10, 10),
+            {"near": Cuboid(2, 0, 0, 3, 1, 1), "far": Cuboid(8, 8, 8, 9, 9, 9)},
+            Point3D(0, 0, 0),
+            Point3D(5, 5, 5),
+        )
+        np.testing.assert_allclose(world.clearance(), [2])
+        dist, names = world.nearest_obstacles(np.array([[2.5, 0.5, 0.5], [9, 9, 10]]), k=2)
+        self.assertEqual(names, [["near", "far"], ["far", "near"]])
+        np.testing.assert_allclose(dist[:, 0], [0, 1])
+
+        # the index is built once and rebuilt after an edit
+        index = world.get_obstacle_index()
+        self.assertIs(index, world.get_obstacle_index())
+        world._obstacles["near"] = Cuboid(1, 0, 0, 2, 1, 1)
+        world.invalidate()
+        self.assertIsNot(index, world.get_obstacle_index())
+        np.testing.assert_allclose(world.clearance(), [1])
+
+        empty = Continous3D_Static(Cuboid(0, 0, 0, 10, 10, 10))
+        dist, names = empty.nearest_obstacles()
+        self.assertTrue(np.isinf(dist[0, 0]))
+        self.assertEqual(names, [[None]])
+        with self.assertRaises(ValueError):
+            empty.nearest_obstacles(k=0)
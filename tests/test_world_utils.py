@@ -1,5 +1,14 @@
-from pybotic.utils.world_utils import load_3d_map_from_file
+from pybotic.utils.world_utils import (
+    load_3d_map_from_file,
+    load_3d_maps_from_files,
+    load_3d_maps_async,
+    load_3d_maps,
+    MapLoadResult,
+)
+import asyncio
 import unittest
+from unittest import mock
+import warnings
 
 
 class TestLoad3DWorldMap(unittest.TestCase):
@@ -62,3 +71,94 @@ class TestLoad3DWorldMap(unittest.TestCase):
         # if any of the keywords are missing raise a warning
         with self.assertWarns(Warning):
             load_3d_map_from_file(self.path + "warn1.txt")
+
+
+class TestBulkLoad(unittest.TestCase):
+    """
+        Tester for the bulk map loaders
+        test covered:
+            - glob and list inputs
+            - errors collected per file
+            - thread, process and asyncio front ends
+    """
+
+    def setUp(self):
+        self.pattern = "tests/map_files/*.txt"
+        self.valid = {
+            "tests/map_files/sample_world.txt",
+            "tests/map_files/warn1.txt",
+            "tests/map_files/warn_obs_repeat.txt",
+        }
+
+    def test_collect(self):
+        # every file is accounted for, bad ones do not abort the batch
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            maps, errors = load_3d_maps(self.pattern, max_workers=4)
+        self.assertEqual(set(maps), self.valid)
+        self.assertEqual(len(maps) + len(errors), 10)
+        self.assertIsInstance(errors["tests/map_files/no_bound.txt"], KeyError)
+        self.assertIsInstance(errors["tests/map_files/syntax_err1.txt"], SyntaxError)
+        self.assertIsInstance(errors["tests/map_files/value_err1.txt"], ValueError)
+
+        # a plain path is not a pattern, missing files are reported
+        maps, errors = load_3d_maps("tests/map_files/missing.txt")
+        self.assertEqual(maps, {})
+        self.assertIsInstance(errors["tests/map_files/missing.txt"], FileNotFoundError)
+
+    def test_list_and_process(self):
+        # explicit list with missing and unsupported files, process pool
+        files = ["invalid", "tests/map_files/invalid1.invalid", *self.valid]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = list(
+                load_3d_maps_from_files(files, max_workers=2, executor="process")
+            )
+        self.assertEqual({result.file_name for result in results}, set(files))
+        self.assertEqual(
+            {result.file_name for result in results if result.ok}, self.valid
+        )
+        with self.assertRaises(ValueError):
+            list(load_3d_maps_from_files(files, executor="invalid"))
+
+    def test_async(self):
+        # asyncio front end yields the same results
+        async def collect():
+            return [result async for result in load_3d_maps_async(self.pattern, 4)]
+
+        loop = asyncio.new_event_loop()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                results = loop.run_until_complete(collect())
+        finally:
+            loop.close()
+        self.assertEqual(len(results), 10)
+        self.assertEqual({result.file_name for result in results if result.ok}, self.valid)
+
+    def test_early_stop(self):
+        # at most max_workers files are in flight, closing cancels the rest
+        files = ["tests/map_files/sample_world.txt"] * 100
+        loaded = []
+
+        def load(file_name):
+            loaded.append(file_name)
+            return MapLoadResult(file_name)
+
+        with mock.patch("pybotic.utils.world_utils._load_one", load):
+            results = load_3d_maps_from_files(files, max_workers=2)
+            self.assertTrue(next(results).ok)
+            results.close()
+
+            async def first():
+                results = load_3d_maps_async(files, 2)
+                result = await results.__anext__()
+                await results.aclose()
+                return result
+
+            loop = asyncio.new_event_loop()
+            try:
+                self.assertTrue(loop.run_until_complete(first()).ok)
+            finally:
+                loop.close()
+        self.assertLessEqual(len(loaded), 2 * 3)